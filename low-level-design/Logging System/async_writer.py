@@ -0,0 +1,105 @@
+from collections import deque
+from typing import Callable, List
+import sys
+import threading
+
+class AsyncWriter:
+    """Runs a record handler on a background thread fed by a bounded queue.
+
+    Callers only append to the queue. The writer thread drains it in batches, lets
+    the handlers format every record of a batch into memory and writes the whole
+    batch to the stream at once. Handlers write their lines through emit.
+    """
+
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop-oldest'
+    DROP_NEWEST = 'drop-newest'
+
+    def __init__(self, handle: Callable, capacity: int = 10000, overflow: str = BLOCK,
+                 batch_size: int = 1024, stream=None):
+        if overflow not in (self.BLOCK, self.DROP_OLDEST, self.DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy {overflow}")
+        # called as handle(message, severity, args) on the writer thread
+        self.handle = handle
+        self.capacity = capacity
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.stream = stream
+        self.dropped = 0
+        self._queue = deque()
+        self._lines: List[str] = []
+        self._busy = False
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="logger-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, message, severity, args=()):
+        """Queues a record. Returns False if it was dropped because the queue was full."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("The writer has been shut down")
+            if len(self._queue) >= self.capacity:
+                if self.overflow == self.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self.overflow == self.DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    while len(self._queue) >= self.capacity and not self._closed:
+                        self._condition.wait()
+                    # close() may have run while we waited; the writer thread would never drain the record
+                    if self._closed:
+                        raise RuntimeError("The writer has been shut down")
+            self._queue.append((message, severity, args))
+            if len(self._queue) == 1:
+                self._condition.notify_all()
+        return True
+
+    def emit(self, line: str):
+        self._lines.append(line)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+                self._busy = True
+                self._condition.notify_all()
+
+            try:
+                for message, severity, args in batch:
+                    try:
+                        self.handle(message, severity, args)
+                    except NotImplementedError as error:
+                        self._lines.append(str(error))
+                    except Exception as error:
+                        # one bad record must not take the writer thread down with it
+                        self._lines.append(f"Dropped a log record: {error}")
+                if self._lines:
+                    stream = self.stream or sys.stdout
+                    stream.write("\n".join(self._lines) + "\n")
+                    stream.flush()
+            except Exception as error:
+                print(f"Cannot write log records: {error!r}", file=sys.stderr)
+            finally:
+                self._lines.clear()
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def flush(self, timeout: float = None):
+        """Waits until every queued record has been written. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self, timeout: float = None):
+        """Drains the queue and stops the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
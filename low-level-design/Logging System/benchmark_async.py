@@ -0,0 +1,73 @@
+'''
+Measures how long a log() call blocks the caller with 8 producer threads,
+once with the synchronous handler chain and once with the async writer, both
+writing to a stream that is slow on every write like a busy terminal or pipe.
+'''
+from logger import Logger
+import sys
+import threading
+import time
+
+PRODUCERS = 8
+MESSAGES_PER_PRODUCER = 5000
+
+class SlowStream:
+    def __init__(self, delay: float = 20e-6):
+        self.delay = delay
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        deadline = time.perf_counter() + self.delay
+        while time.perf_counter() < deadline:
+            pass
+
+    def flush(self):
+        pass
+
+def produce(logger: Logger, producer: int, latencies: list):
+    timings = []
+    for counter in range(MESSAGES_PER_PRODUCER):
+        start = time.perf_counter()
+        logger.log(f"producer {producer} message {counter}", counter % 3 + 1)
+        timings.append(time.perf_counter() - start)
+    latencies.extend(timings)
+
+def run(logger: Logger):
+    latencies = []
+    threads = [threading.Thread(target=produce, args=(logger, producer, latencies)) for producer in range(PRODUCERS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.flush()
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, latencies
+
+def report(name: str, elapsed: float, latencies: list, stream: SlowStream):
+    p50 = latencies[len(latencies) // 2] * 1e6
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e6
+    print(f"{name:>6}: p50 {p50:8.1f}us  p99 {p99:8.1f}us  max {latencies[-1] * 1e6:9.1f}us  "
+          f"total {elapsed:.2f}s  {stream.writes} writes", file=sys.__stdout__)
+
+def main():
+    logger = Logger()
+
+    stream = SlowStream()
+    sys.stdout = stream
+    try:
+        report("sync", *run(logger), stream)
+    finally:
+        sys.stdout = sys.__stdout__
+    logger.history.clear()
+
+    stream = SlowStream()
+    logger.enable_async(capacity=100000, stream=stream)
+    elapsed, latencies = run(logger)
+    logger.shutdown()
+    report("async", elapsed, latencies, stream)
+
+if __name__ == "__main__":
+    main()
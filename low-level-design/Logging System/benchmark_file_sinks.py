@@ -0,0 +1,43 @@
+'''
+Compares write throughput of text and binary RotatingFileSinks against printing
+every record to an unbuffered file, then streams the records back with the
+decoder.
+'''
+from file_logger import RotatingFileSink, read_rotated
+import os
+import tempfile
+import time
+
+RECORDS = 500_000
+
+def write_print(path: str):
+    with open(path, "w", buffering=1) as log_file:
+        for counter in range(RECORDS):
+            print(f"{time.time():.6f} {counter % 3 + 1} request {counter} served in 12ms", file=log_file, flush=True)
+
+def write_sink(path: str, binary: bool):
+    sink = RotatingFileSink(path, binary=binary, max_bytes=16 << 20)
+    for counter in range(RECORDS):
+        sink.write(time.time(), counter % 3 + 1, f"request {counter} served in 12ms")
+    sink.close()
+
+def size_of(directory: str):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+def main():
+    for name, writer in (("print", write_print), ("text", lambda path: write_sink(path, False)),
+                         ("binary", lambda path: write_sink(path, True))):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "app.log")
+            start = time.perf_counter()
+            writer(path)
+            write_time = time.perf_counter() - start
+            line = f"{name:>7}: {RECORDS / write_time:10.0f} records/s written, {size_of(directory) / 1e6:6.1f} MB"
+            if name != "print":
+                start = time.perf_counter()
+                count = sum(1 for _ in read_rotated(path))
+                line += f", {count / (time.perf_counter() - start):10.0f} records/s read back"
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+'''
+Logs from a pool of worker processes into one aggregator, reports records per
+second and checks that each process's records appear in the aggregated history
+in the order they were logged.
+'''
+from log_aggregator import LogAggregator
+from log_history import LogHistory
+from logger import Logger
+import multiprocessing
+import os
+import re
+import time
+
+WORKERS = 4
+TASKS = 16
+RECORDS_PER_TASK = 20_000
+
+def work(task: int):
+    logger = Logger()
+    for counter in range(RECORDS_PER_TASK):
+        logger.log("task %d record %d", counter % 3 + 1, task, counter)
+    return task
+
+def main():
+    Logger.history = LogHistory(capacity=TASKS * RECORDS_PER_TASK)
+    logger = Logger()
+    with open(os.devnull, "w") as devnull:
+        logger.enable_async(capacity=100_000, stream=devnull)
+        aggregator = LogAggregator(logger)
+        initializer, initargs = aggregator.worker_initializer()
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(WORKERS, initializer=initializer, initargs=initargs) as pool:
+            list(pool.imap_unordered(work, range(TASKS)))
+            pool.close()
+            pool.join()
+        aggregator.close()
+        elapsed = time.perf_counter() - start
+        logger.shutdown()
+
+    last_seen = {}
+    pattern = re.compile(r"\[(\d+)\] task (\d+) record (\d+)")
+    for record in Logger.history:
+        pid, task, counter = map(int, pattern.match(record.message).groups())
+        assert last_seen.get((pid, task), -1) == counter - 1, f"record {counter} of task {task} out of order"
+        last_seen[(pid, task)] = counter
+
+    print(f"{aggregator.received} records from {WORKERS} processes in {elapsed:.2f}s: "
+          f"{aggregator.received / elapsed:.0f} records/s")
+    print("every process's records kept their order")
+
+if __name__ == "__main__":
+    main()
@@ -9,11 +9,11 @@ class ErrorLogger(Log):
     def log(self, message, severity, history):
         if self.severity == severity:
             modified_message = f"\033[91m{message}\033[0m"
-            print(modified_message)
-            history.append(message)
+            self.output(modified_message)
+            history.record(self.severity, message)
         elif self.successor:
             self.successor.log(message, severity, history)
         else:
-            history.append(f"Cannot handle \033[91m{severity}\033[0m")
+            history.record(severity, f"Cannot handle {severity}")
             raise NotImplementedError(f"Cannot handle {severity}")
         
\ No newline at end of file
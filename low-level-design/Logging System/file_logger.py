@@ -0,0 +1,171 @@
+from log import Log
+from log_history import LogHistory, LogRecord
+from typing import Iterable, Iterator
+import glob
+import os
+import re
+import struct
+import threading
+import time
+
+BINARY_MAGIC = b"LOGBIN1\n"
+# message length, timestamp, severity; followed by the utf-8 message
+BINARY_HEADER = struct.Struct("<IdH")
+# text records are one line each, so backslashes and newlines in messages are escaped
+_ESCAPED = re.compile(r"\\(.)")
+_UNESCAPE = {"n": "\n", "r": "\r"}
+
+def _escape(message: str):
+    if "\\" in message or "\n" in message or "\r" in message:
+        return message.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+    return message
+
+def _unescape(message: str):
+    if "\\" in message:
+        return _ESCAPED.sub(lambda match: _UNESCAPE.get(match.group(1), match.group(1)), message)
+    return message
+
+class RotatingFileSink:
+    """Appends log records to a file through a large in-memory buffer and rotates it by size or age.
+
+    Records are encoded either as text lines or, with binary=True, as length-prefixed
+    binary records. Rotated files are renamed to path.1, path.2, ... with path.1 the newest.
+    The buffer is written out when it is full, every flush_interval seconds, and at once
+    after a record of flush_severity or above, so a quiet process does not sit on records.
+    """
+
+    def __init__(self, path: str, binary: bool = False, buffer_size: int = 1 << 20, max_bytes: int = 64 << 20,
+                 max_age: float = None, backups: int = 5, flush_interval: float = 1.0, flush_severity: int = 3):
+        self.path = path
+        self.binary = binary
+        self.buffer_size = buffer_size
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.flush_severity = flush_severity
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._open()
+        self._closed = threading.Event()
+        if flush_interval is not None:
+            threading.Thread(target=self._flush_periodically, name="log-file-flusher", daemon=True).start()
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        self._opened_at = time.time()
+        self._size = self._file.tell()
+        if self.binary and self._size == 0:
+            self._buffer += BINARY_MAGIC
+
+    def write(self, timestamp: float, severity: int, message: str):
+        if self.binary:
+            encoded = message.encode()
+            record = BINARY_HEADER.pack(len(encoded), timestamp, severity) + encoded
+        else:
+            record = f"{timestamp:.6f} {severity} {_escape(message)}\n".encode()
+        with self._lock:
+            self._buffer += record
+            if self._size + len(self._buffer) >= self.max_bytes or (
+                    self.max_age is not None and timestamp - self._opened_at >= self.max_age):
+                self._rotate()
+            elif len(self._buffer) >= self.buffer_size or severity >= self.flush_severity:
+                self._flush()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._closed.is_set():
+                    return
+                self._flush()
+
+    def _flush(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._size += len(self._buffer)
+            self._buffer.clear()
+        self._file.flush()
+
+    def _rotate(self):
+        self._flush()
+        self._file.close()
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self._open()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        with self._lock:
+            self._closed.set()
+            self._flush()
+            self._file.close()
+
+class FileLogger(Log):
+    """A handler that writes the severities it handles to a RotatingFileSink.
+
+    Like the console handlers it passes other severities to its successor. It can be
+    registered with Logger.add_handler for one severity or with Logger.add_sink to
+    receive a copy of every record it handles next to the console handlers.
+    """
+
+    def __init__(self, sink: RotatingFileSink, severities: Iterable[int] = (1, 2, 3), successor=None):
+        self.sink = sink
+        self.severities = frozenset(severities)
+        self.severity = min(self.severities)
+        self.successor = successor
+
+    def log(self, message, severity, history: LogHistory = None):
+        if severity in self.severities:
+            if history is not None:
+                history.record(severity, message)
+            self.sink.write(time.time(), severity, message)
+        elif self.successor:
+            self.successor.log(message, severity, history)
+        else:
+            if history is not None:
+                history.record(severity, f"Cannot handle {severity}")
+            raise NotImplementedError(f"Cannot handle {severity}")
+
+    def flush(self):
+        self.sink.flush()
+
+def read_records(path: str, chunk_size: int = 1 << 20) -> Iterator[LogRecord]:
+    """Lazily decodes a text or binary log file written by RotatingFileSink."""
+    with open(path, "rb") as log_file:
+        if log_file.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            log_file.seek(0)
+            for line in log_file:
+                timestamp, severity, message = line.decode().rstrip("\n").split(" ", 2)
+                yield LogRecord(float(timestamp), int(severity), _unescape(message))
+            return
+
+        header_size = BINARY_HEADER.size
+        buffer = b""
+        while True:
+            chunk = log_file.read(chunk_size)
+            if not chunk:
+                break
+            buffer += chunk
+            offset = 0
+            while offset + header_size <= len(buffer):
+                length, timestamp, severity = BINARY_HEADER.unpack_from(buffer, offset)
+                end = offset + header_size + length
+                if end > len(buffer):
+                    break
+                yield LogRecord(timestamp, severity, buffer[offset + header_size:end].decode())
+                offset = end
+            buffer = buffer[offset:]
+
+def read_rotated(path: str) -> Iterator[LogRecord]:
+    """Lazily decodes a log and its rotated backups, oldest first."""
+    backups = sorted(glob.glob(f"{glob.escape(path)}.[0-9]*"), key=lambda backup: -int(backup.rsplit(".", 1)[1]))
+    for backup in backups + ([path] if os.path.exists(path) else []):
+        yield from read_records(backup)
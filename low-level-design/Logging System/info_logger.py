@@ -8,11 +8,11 @@ class InfoLogger(Log):
 
     def log(self, message, severity, history):
         if self.severity == severity:
-            history.append(message)
-            print(message)
+            history.record(self.severity, message)
+            self.output(message)
         elif self.successor:
             self.successor.log(message, severity, history)
         else:
-            history.append(f"Cannot handle \033[91m{severity}\033[0m")
+            history.record(severity, f"Cannot handle {severity}")
             raise NotImplementedError(f"Cannot handle {severity}")
         
\ No newline at end of file
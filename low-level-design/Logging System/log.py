@@ -1,8 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List
+from log_history import LogHistory
 
 class Log(ABC):
 
+    # where handlers write their formatted lines, the Logger swaps this out in async mode
+    output = print
+
+    def flush(self):
+        """Writes out anything the handler buffers. Console handlers buffer nothing."""
+        pass
+
     @ abstractmethod
-    def log(self, message:str, severity:int, history: List[str]):
+    def log(self, message:str, severity:int, history: LogHistory):
         pass
\ No newline at end of file
@@ -0,0 +1,104 @@
+from logger import Logger
+from typing import List
+import atexit
+import multiprocessing
+import multiprocessing.util
+import os
+import threading
+
+class ProcessLogClient:
+    """Ships a worker process's records to a LogAggregator in batches.
+
+    It has the same submit/flush/close interface as AsyncWriter, so the worker's
+    Logger uses it in place of its own handlers once Logger.forward_to is called.
+    """
+
+    def __init__(self, queue, batch_size: int = 256, flush_interval: float = 0.05):
+        self.queue = queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.pid = os.getpid()
+        self._sequence = 0
+        self._batch: List[tuple] = []
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._timer = threading.Thread(target=self._flush_periodically, name="log-client", daemon=True)
+        self._timer.start()
+        # pool workers leave through multiprocessing's own exit hooks rather than atexit
+        atexit.register(self.close)
+        multiprocessing.util.Finalize(self, self.close, exitpriority=100)
+
+    def submit(self, message, severity, args=()):
+        try:
+            if args:
+                message = message % args
+            elif callable(message):
+                message = message()
+        except Exception as error:
+            # same fallback as Logger._handle, so a broken record never raises into worker code
+            message = f"Cannot format log message {message!r} with {args!r}: {error!r}"
+        with self._lock:
+            self._sequence += 1
+            self._batch.append((self._sequence, severity, message))
+            if len(self._batch) >= self.batch_size:
+                self._send()
+        return True
+
+    def _send(self):
+        if self._batch:
+            self.queue.put((self.pid, self._batch))
+            self._batch = []
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self, timeout: float = None):
+        with self._lock:
+            self._send()
+        return True
+
+    def close(self, timeout: float = None):
+        if not self._closed.is_set():
+            self._closed.set()
+            self.flush()
+
+class LogAggregator:
+    """Receives batches from worker processes and logs them through one process's Logger.
+
+    The aggregator's Logger owns the sinks and the global history. A worker's batches
+    travel through a single queue in the order they were sent, so records from one
+    process keep their order in the history. Each message is prefixed with its pid.
+    """
+
+    def __init__(self, logger: Logger = None):
+        self.logger = logger or Logger()
+        self.queue = multiprocessing.Queue()
+        self.received = 0
+        # pid -> last sequence number seen, to detect out of order or lost batches
+        self.last_sequence = {}
+        self._thread = threading.Thread(target=self._run, name="log-aggregator", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            pid, batch = item
+            for sequence, severity, message in batch:
+                if sequence != self.last_sequence.get(pid, 0) + 1:
+                    self.logger.log(f"[{pid}] records {self.last_sequence.get(pid, 0) + 1}-{sequence - 1} are missing", 3)
+                self.last_sequence[pid] = sequence
+                self.logger.log(f"[{pid}] {message}", severity)
+            self.received += len(batch)
+
+    def worker_initializer(self):
+        """Returns (initializer, initargs) that make a process pool's workers forward to this aggregator."""
+        return Logger.forward_to, (self.queue,)
+
+    def close(self):
+        """Stops the aggregator after every batch already queued has been logged."""
+        self.queue.put(None)
+        self._thread.join()
+        self.logger.flush()
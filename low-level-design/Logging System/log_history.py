@@ -0,0 +1,107 @@
+from collections import deque, namedtuple
+from itertools import islice
+from typing import Deque, Dict, List
+import threading
+import time
+
+LogRecord = namedtuple('LogRecord', ['timestamp', 'severity', 'message'])
+
+class LogHistory:
+    """A fixed-capacity ring buffer of LogRecords with a per-severity index.
+
+    Once full, every new record evicts the oldest one, so memory stays capped.
+    Each severity keeps the sequence numbers of its retained records in order, so
+    the newest records of one severity are found without looking at the others.
+    """
+
+    def __init__(self, capacity: int = 10000):
+        if capacity <= 0:
+            raise ValueError("Capacity should be positive")
+        self.capacity = capacity
+        self._records: List[LogRecord] = [None] * capacity
+        self._next_sequence = 0
+        self._by_severity: Dict[int, Deque[int]] = {}
+        # optional LogIndex kept in step with appends and evictions, see attach_index
+        self.index = None
+        self.lock = threading.Lock()
+
+    def record(self, severity: int, message: str):
+        """Appends a record and returns the record it evicted, if any."""
+        with self.lock:
+            sequence = self._next_sequence
+            slot = sequence % self.capacity
+            evicted = self._records[slot]
+            if evicted is not None:
+                # records leave in the order they came, so the evicted one is first in its index
+                evicted_sequences = self._by_severity[evicted.severity]
+                evicted_sequences.popleft()
+                if not evicted_sequences:
+                    del self._by_severity[evicted.severity]
+                if self.index is not None:
+                    self.index.evict(sequence - self.capacity, evicted)
+            record = LogRecord(time.time(), severity, message)
+            self._records[slot] = record
+            self._by_severity.setdefault(severity, deque()).append(sequence)
+            if self.index is not None:
+                self.index.add(sequence, record)
+            self._next_sequence += 1
+            return evicted
+
+    def attach_index(self, index):
+        """Indexes the retained records and keeps the index in step with every later append and eviction."""
+        with self.lock:
+            index.clear()
+            for sequence in range(self._oldest_sequence(), self._next_sequence):
+                index.add(sequence, self._records[sequence % self.capacity])
+            self.index = index
+
+    def get(self, sequence: int):
+        """Returns the record with a sequence number, or None if it has been evicted."""
+        if self._oldest_sequence() <= sequence < self._next_sequence:
+            return self._records[sequence % self.capacity]
+        return None
+
+    def _oldest_sequence(self):
+        return max(0, self._next_sequence - self.capacity)
+
+    def __len__(self):
+        return self._next_sequence - self._oldest_sequence()
+
+    def __iter__(self):
+        with self.lock:
+            records = [self._records[sequence % self.capacity]
+                       for sequence in range(self._oldest_sequence(), self._next_sequence)]
+        return iter(records)
+
+    def _newest_sequences(self, severity: int = None):
+        if severity is None:
+            return iter(range(self._next_sequence - 1, self._oldest_sequence() - 1, -1))
+        return reversed(self._by_severity.get(severity, ()))
+
+    def last(self, count: int, severity: int = None) -> List[LogRecord]:
+        """Returns the newest count records, optionally of one severity, oldest first."""
+        with self.lock:
+            records = [self._records[sequence % self.capacity]
+                       for sequence in islice(self._newest_sequences(severity), count)]
+        records.reverse()
+        return records
+
+    def since(self, timestamp: float, severity: int = None) -> List[LogRecord]:
+        """Returns the records logged at or after timestamp, optionally of one severity, oldest first."""
+        records = []
+        with self.lock:
+            for sequence in self._newest_sequences(severity):
+                record = self._records[sequence % self.capacity]
+                if record.timestamp < timestamp:
+                    break
+                records.append(record)
+        records.reverse()
+        return records
+
+    def clear(self):
+        with self.lock:
+            self._records = [None] * self.capacity
+            self._next_sequence = 0
+            self._by_severity.clear()
+            if self.index is not None:
+                self.index.clear()
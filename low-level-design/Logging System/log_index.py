@@ -0,0 +1,115 @@
+from bisect import bisect_left
+from log_history import LogHistory, LogRecord
+from typing import Dict, List
+import re
+
+TOKEN = re.compile(r"\w+")
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN.findall(text.lower())
+
+class Postings:
+    """The ascending sequence numbers of the records containing one token.
+
+    Evicted entries are skipped with a start offset and compacted away once they
+    make up half the list, so removing the oldest entry is amortized O(1).
+    """
+
+    __slots__ = ('sequences', 'start')
+
+    def __init__(self):
+        self.sequences: List[int] = []
+        self.start = 0
+
+    def __len__(self):
+        return len(self.sequences) - self.start
+
+    def __iter__(self):
+        return iter(self.sequences[self.start:])
+
+    def __contains__(self, sequence: int):
+        position = bisect_left(self.sequences, sequence, self.start)
+        return position < len(self.sequences) and self.sequences[position] == sequence
+
+    def append(self, sequence: int):
+        self.sequences.append(sequence)
+
+    def pop_oldest(self):
+        self.start += 1
+        if self.start * 2 >= len(self.sequences):
+            del self.sequences[:self.start]
+            self.start = 0
+
+class LogIndex:
+    """An inverted index from message tokens to the LogHistory records containing them.
+
+    LogHistory feeds it every append and eviction, so it only ever covers the
+    records the history still retains.
+    """
+
+    def __init__(self, history: LogHistory):
+        self.history = history
+        self._postings: Dict[str, Postings] = {}
+        history.attach_index(self)
+
+    def add(self, sequence: int, record: LogRecord):
+        for token in set(tokenize(record.message)):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = Postings()
+            postings.append(sequence)
+
+    def evict(self, sequence: int, record: LogRecord):
+        # the evicted record is always the oldest one, so it is first in each of its postings
+        for token in set(tokenize(record.message)):
+            postings = self._postings[token]
+            postings.pop_oldest()
+            if not postings:
+                del self._postings[token]
+
+    def clear(self):
+        self._postings.clear()
+
+    def __len__(self):
+        return len(self._postings)
+
+    def search(self, query: str, phrase: bool = False, severity: int = None, since: float = None,
+               until: float = None, limit: int = None) -> List[LogRecord]:
+        """Returns the records containing every term of the query, newest first.
+
+        With phrase=True the terms must also appear next to each other in order.
+        Results can be narrowed to one severity and a [since, until] time range.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self.history.lock:
+            postings = [self._postings.get(term) for term in set(terms)]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            shortest, others = postings[0], postings[1:]
+
+            results = []
+            for sequence in reversed(list(shortest)):
+                if not all(sequence in other for other in others):
+                    continue
+                record = self.history.get(sequence)
+                if since is not None and record.timestamp < since:
+                    # sequence numbers follow time, so nothing older can match either
+                    break
+                if until is not None and record.timestamp > until:
+                    continue
+                if severity is not None and record.severity != severity:
+                    continue
+                if phrase and not self._contains_phrase(tokenize(record.message), terms):
+                    continue
+                results.append(record)
+                if limit is not None and len(results) >= limit:
+                    break
+            return results
+
+    @staticmethod
+    def _contains_phrase(tokens: List[str], terms: List[str]):
+        length = len(terms)
+        return any(tokens[position:position + length] == terms for position in range(len(tokens) - length + 1))
@@ -1,9 +1,12 @@
-from typing import List
+from datetime import datetime
 import threading
 
+from async_writer import AsyncWriter
 from debug_logger import DebugLogger
 from error_logger import ErrorLogger
 from info_logger import InfoLogger
+from log import Log
+from log_history import LogHistory
 
 class Logger:
 
@@ -12,7 +15,16 @@ class Logger:
     error = ErrorLogger()
     debug = DebugLogger(error)
     info = InfoLogger(debug)
-    history: List[str] = []
+    history = LogHistory(capacity=10000)
+    # severity -> handler, so a record goes straight to its handler and an unknown severity is one dict miss.
+    # It does not make handled records faster: log() also checks the level and the async writer,
+    # which costs about as much as the chain's two extra hops.
+    _dispatch = {handler.severity: handler for handler in (info, debug, error)}
+    # records with a lower severity are dropped before any formatting
+    min_level = 0
+    # handlers that get a copy of every record they accept, e.g. FileLoggers
+    _sinks = []
+    _writer: AsyncWriter = None
 
     def __new__(cls, *args, **kwargs):
         with cls._lock:
@@ -20,11 +32,122 @@ class Logger:
                 cls._instance = super().__new__(cls, *args, **kwargs)
         return cls._instance
     
-    def log(self, message, severity):
+    def log(self, message, severity, *args):
+        """Logs a message. Formatting is deferred until the record passes the level filter:
+        with args the message is a %-format string, and a callable message is only called then.
+        """
+        if severity < self.min_level:
+            return
+        writer = self._writer
+        if writer:
+            writer.submit(message, severity, args)
+            return
         try:
-            self.info.log(message=message, severity=severity, history=self.history)
+            self._handle(message, severity, args)
         except NotImplementedError as error:
             print(error)
 
-    def log_history(self):
-        print(self.history)
+    def _handle(self, message, severity, args=()):
+        handler = self._dispatch.get(severity)
+        if handler is None:
+            self.history.record(severity, f"Cannot handle {severity}")
+            raise NotImplementedError(f"Cannot handle {severity}")
+        if args or type(message) is not str:
+            try:
+                if args:
+                    message = message % args
+                elif callable(message):
+                    message = message()
+            except Exception as error:
+                # a broken record is reported in its place rather than lost or raised into the writer thread
+                message = f"Cannot format log message {message!r} with {args!r}: {error!r}"
+        handler.log(message, severity, self.history)
+        for sink in self._sinks:
+            if severity in sink.severities:
+                sink.log(message, severity, None)
+
+    def set_level(self, min_level: int):
+        Logger.min_level = min_level
+
+    def add_handler(self, handler: Log):
+        """Registers a handler for its severity, replacing the current one."""
+        with self._lock:
+            if isinstance(Logger._writer, AsyncWriter):
+                handler.output = Logger._writer.emit
+            self._dispatch[handler.severity] = handler
+
+    def log_history(self, count: int = None, severity: int = None):
+        """Prints the newest count records, or all retained ones, optionally of one severity."""
+        records = self.history.last(count if count is not None else self.history.capacity, severity)
+        for record in records:
+            print(f"{datetime.fromtimestamp(record.timestamp):%Y-%m-%d %H:%M:%S} [{record.severity}] {record.message}")
+
+    def last_errors(self, count: int):
+        return self.history.last(count, severity=self.error.severity)
+
+    def records_since(self, timestamp: float, severity: int = None):
+        return self.history.since(timestamp, severity)
+
+    def enable_index(self):
+        """Starts maintaining an inverted index over the history, see search."""
+        from log_index import LogIndex
+
+        with self._lock:
+            if self.history.index is None:
+                LogIndex(self.history)
+        return self.history.index
+
+    def search(self, query: str, phrase: bool = False, severity: int = None, since: float = None,
+               until: float = None, limit: int = None):
+        """Finds retained records by terms or an exact phrase, newest first. Needs enable_index."""
+        if self.history.index is None:
+            raise RuntimeError("Call enable_index before searching the history")
+        return self.history.index.search(query, phrase=phrase, severity=severity, since=since, until=until, limit=limit)
+
+    def _handlers(self):
+        return list(self._dispatch.values())
+
+    def add_sink(self, handler: Log):
+        """Sends a copy of every record the handler accepts to it, next to the regular handlers."""
+        with self._lock:
+            self._sinks.append(handler)
+
+    def remove_sink(self, handler: Log):
+        with self._lock:
+            self._sinks.remove(handler)
+            handler.flush()
+
+    def enable_async(self, capacity: int = 10000, overflow: str = AsyncWriter.BLOCK, batch_size: int = 1024, stream=None):
+        """Switches to asynchronous logging: log() only enqueues and a background thread does the writing."""
+        with self._lock:
+            if Logger._writer:
+                return
+            writer = AsyncWriter(self._handle, capacity=capacity, overflow=overflow,
+                                 batch_size=batch_size, stream=stream)
+            for handler in self._handlers():
+                handler.output = writer.emit
+            Logger._writer = writer
+
+    @classmethod
+    def forward_to(cls, queue, batch_size: int = 256, flush_interval: float = 0.05):
+        """Makes this process's Logger ship its records to a LogAggregator listening on queue."""
+        from log_aggregator import ProcessLogClient
+
+        with cls._lock:
+            cls._writer = ProcessLogClient(queue, batch_size=batch_size, flush_interval=flush_interval)
+
+    def flush(self, timeout: float = None):
+        """Blocks until every record logged so far has been written."""
+        done = self._writer.flush(timeout) if self._writer else True
+        for sink in self._sinks:
+            sink.flush()
+        return done
+
+    def shutdown(self):
+        """Drains pending records and returns to synchronous logging."""
+        with self._lock:
+            writer, Logger._writer = Logger._writer, None
+        if writer:
+            writer.close()
+            for handler in self._handlers():
+                handler.__dict__.pop('output', None)
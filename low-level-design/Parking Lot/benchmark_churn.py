@@ -0,0 +1,47 @@
+'''
+Parks and releases vehicles repeatedly and reports how the entrance heaps and
+traced memory evolve. Both should stay flat no matter how many cycles run.
+'''
+from parking_lot import ParkingLot
+import random
+import time
+import tracemalloc
+
+TOTAL_SPOTS = 3000
+ROUNDS = 10
+CYCLES_PER_ROUND = 5000
+
+def heap_entries(parking_lot: ParkingLot):
+    return sum(len(heap) for entrance in parking_lot.entrances.values()
+               for heap in entrance.closest_spots_based_on_type.values())
+
+def main():
+    random.seed(7)
+    parking_lot = ParkingLot(TOTAL_SPOTS, 5, entrances=[(0, 0), (0, 60), (60, 0), (60, 60)])
+    parked = []
+    counter = 0
+
+    tracemalloc.start()
+    print(f"{'cycles':>8} {'parked':>8} {'heap entries':>14} {'traced KiB':>12} {'us/cycle':>10}")
+    for round_no in range(1, ROUNDS + 1):
+        start = time.perf_counter()
+        for _ in range(CYCLES_PER_ROUND):
+            if parked and (len(parked) > TOTAL_SPOTS // 2 or random.random() < 0.45):
+                reg_no = parked.pop(random.randrange(len(parked)))
+                parking_lot.release_spot(reg_no)
+            else:
+                counter += 1
+                reg_no = f"KA{counter}"
+                try:
+                    parking_lot.assign_spot(reg_no, "red", random.randint(1, 3), random.randint(1, 4))
+                    parked.append(reg_no)
+                except ValueError:
+                    pass
+        elapsed = time.perf_counter() - start
+        current, _ = tracemalloc.get_traced_memory()
+        print(f"{round_no * CYCLES_PER_ROUND:>8} {len(parked):>8} {heap_entries(parking_lot):>14} "
+              f"{current / 1024:>12.1f} {elapsed / CYCLES_PER_ROUND * 1e6:>10.2f}")
+    tracemalloc.stop()
+
+if __name__ == "__main__":
+    main()
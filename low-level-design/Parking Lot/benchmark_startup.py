@@ -0,0 +1,36 @@
+'''
+Compares ParkingLot cold start using the batched NumPy distance matrix against
+the per-spot loop in Entrance, and checks both produce the same orderings.
+'''
+from distance_matrix import has_numpy
+from parking_lot import ParkingLot
+import time
+
+TOTAL_SPOTS = 200_000
+ENTRANCES = [(0, 0), (0, 150), (0, 300), (0, 450), (450, 0), (450, 150),
+             (450, 300), (450, 450), (150, 0), (300, 0), (150, 450), (300, 450)]
+
+def build(vectorized: bool):
+    start = time.perf_counter()
+    parking_lot = ParkingLot(TOTAL_SPOTS, 5, entrances=ENTRANCES, vectorized=vectorized)
+    return parking_lot, time.perf_counter() - start
+
+def orderings(parking_lot: ParkingLot):
+    return {(entrance_no, spot_type): list(heap.to_arrays()[0])
+            for entrance_no, entrance in parking_lot.entrances.items()
+            for spot_type, heap in entrance.closest_spots_based_on_type.items()}
+
+def main():
+    loop_lot, loop_time = build(vectorized=False)
+    print(f"per-spot loop: {loop_time:.2f}s for {TOTAL_SPOTS} spots and {len(ENTRANCES)} entrances")
+
+    if not has_numpy():
+        print("numpy is not installed, skipping the batched build")
+        return
+
+    batched_lot, batched_time = build(vectorized=True)
+    print(f"batched build: {batched_time:.2f}s ({loop_time / batched_time:.1f}x faster)")
+    print("orderings match" if orderings(loop_lot) == orderings(batched_lot) else "ORDERINGS DIFFER")
+
+if __name__ == "__main__":
+    main()
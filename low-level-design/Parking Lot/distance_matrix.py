@@ -0,0 +1,46 @@
+"""This module builds entrance orderings from a batched entrance-by-spot distance matrix.
+
+NumPy is optional. When it is not installed, has_numpy() returns False and
+callers fall back to the per-spot loop in Entrance.
+"""
+from array import array
+from typing import Dict, List, Tuple
+from indexed_heap import IndexedHeap
+from spot_table import SpotTable
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# numpy dtype matching the item size of array('l') so buffers can be shared without conversion
+_LONG = None if np is None else np.dtype(f"i{array('l').itemsize}")
+
+def has_numpy():
+    return np is not None
+
+def compute_distance_matrix(entrance_coordinates: List[Tuple[int, int]], spot_table: SpotTable):
+    """Returns an (entrances x spots) matrix of euclidean distances computed in one batch."""
+    entrances = np.asarray(entrance_coordinates, dtype=np.float64).reshape(-1, 2)
+    xs = np.frombuffer(spot_table.x, dtype=_LONG).astype(np.float64)
+    ys = np.frombuffer(spot_table.y, dtype=_LONG).astype(np.float64)
+    x_diff = entrances[:, 0:1] - xs
+    y_diff = entrances[:, 1:2] - ys
+    return np.sqrt(x_diff * x_diff + y_diff * y_diff)
+
+def build_heaps(distances, spot_table: SpotTable) -> Dict[int, IndexedHeap]:
+    """Builds one IndexedHeap per spot type code from a single entrance's row of distances."""
+    occupied = np.frombuffer(spot_table.occupied, dtype=np.int8)
+    heaps = {}
+    for type_code, indexes in spot_table.spots_by_type.items():
+        spot_indexes = np.frombuffer(indexes, dtype=_LONG)
+        type_distances = distances[spot_indexes]
+        # stable sort by distance keeps ties ordered by rank, the same order IndexedHeap uses
+        order = np.argsort(type_distances, kind='stable')
+        order = order[occupied[spot_indexes[order]] == 0].astype(_LONG)
+        positions = np.full(len(spot_indexes), -1, dtype=_LONG)
+        positions[order] = np.arange(len(order), dtype=_LONG)
+        heaps[type_code] = IndexedHeap.from_arrays(array('l', order.tobytes()),
+                                                   array('d', type_distances.tobytes()),
+                                                   array('l', positions.tobytes()))
+    return heaps
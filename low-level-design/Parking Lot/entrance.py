@@ -1,16 +1,22 @@
 from coordinates import Coordinates
+from indexed_heap import IndexedHeap
 from parking_spot import ParkingSpot
+from spot_table import SpotTable
 from type import Type
-from typing import List, Tuple
-from collections import defaultdict
+from typing import Dict
 import math
-import heapq
 
 class Entrance(Coordinates):
-    def __init__(self, x: int, y: int, parking_spots: List[ParkingSpot]):
+    def __init__(self, x: int, y: int, parking_spots: SpotTable, heaps: Dict[int, IndexedHeap] = None):
         super().__init__(x, y)
-        self.closest_spots_based_on_type = defaultdict(list)
-        self._generate_heap(parking_spots=parking_spots)
+        self.parking_spots = parking_spots
+        # heap keys are a spot's rank among the spots of its type, see SpotTable.type_ranks
+        self.closest_spots_based_on_type: Dict[str, IndexedHeap] = {}
+        if heaps is None:
+            self._generate_heap(parking_spots=parking_spots)
+        else:
+            for type_code, heap in heaps.items():
+                self.closest_spots_based_on_type[Type.types[type_code]] = heap
     
     def _compute_distance(self, coordinate2: Coordinates):
         x_diff = self.get_x() - coordinate2.get_x()
@@ -18,24 +24,33 @@ class Entrance(Coordinates):
 
         return math.sqrt((x_diff * x_diff) + (y_diff * y_diff))
     
-    def _generate_heap(self, parking_spots: List[ParkingSpot]):
-        for spot in parking_spots:
-            distance = self._compute_distance(spot)
-            heap: List[Tuple[float, ParkingSpot]] = self.closest_spots_based_on_type[spot.get_type()]
-            heapq.heappush(heap, (distance, spot))
-        return heap
+    def _generate_heap(self, parking_spots: SpotTable):
+        x, y = self.get_x(), self.get_y()
+        xs, ys, occupied = parking_spots.x, parking_spots.y, parking_spots.occupied
+
+        for type_code, indexes in parking_spots.spots_by_type.items():
+            distances = [math.sqrt((x - xs[index]) ** 2 + (y - ys[index]) ** 2) for index in indexes]
+            available = [rank for rank, index in enumerate(indexes) if not occupied[index]]
+            heap = IndexedHeap.from_items(available, (distances[rank] for rank in available), len(indexes))
+            for rank, index in enumerate(indexes):
+                if occupied[index]:
+                    heap.set_priority(rank, distances[rank])
+            self.closest_spots_based_on_type[Type.types[type_code]] = heap
 
     def get_closest_available_spot(self, type_of: Type):
-        heap: List[Tuple[float, ParkingSpot]] = self.closest_spots_based_on_type[type_of.get_type()]
+        heap = self.closest_spots_based_on_type.get(type_of.get_type())
 
-        while heap:
-            _, spot = heapq.heappop(heap)
-            if spot.is_available():
-                return spot
+        if heap:
+            return self.parking_spots[self.parking_spots.spots_by_type[type_of.get_type_code()][heap.pop()]]
         
-        raise ValueError(f"No Parking Slots for type {type_of}")
+        raise ValueError(f"No Parking Slots for type {type_of.get_type()}")
     
     def add_parking_spot(self, parking_spot: ParkingSpot):
-        heap: List[Tuple[float, ParkingSpot]] = self.closest_spots_based_on_type[parking_spot.get_type()]
-        distance = self._compute_distance(parking_spot)
-        heapq.heappush(heap, (distance, parking_spot))
\ No newline at end of file
+        """Makes a freed spot available again. Returns False if it already was."""
+        heap = self.closest_spots_based_on_type[parking_spot.get_type()]
+        return heap.push(self.parking_spots.type_ranks[parking_spot.get_index()])
+
+    def remove_parking_spot(self, parking_spot: ParkingSpot):
+        """Withdraws a spot claimed through another entrance. Returns False if it was not available."""
+        heap = self.closest_spots_based_on_type[parking_spot.get_type()]
+        return heap.remove(self.parking_spots.type_ranks[parking_spot.get_index()])
@@ -0,0 +1,57 @@
+"""This module replays streams of gate events through a ParkingLot without console output."""
+from collections import namedtuple
+from parking_lot import ParkingLot
+from typing import Iterable, Iterator, Union
+
+# spot is an (x, y) tuple, fee is only set for leave events and error holds the rejection reason
+EventResult = namedtuple('EventResult', ['action', 'reg_no', 'spot', 'fee', 'error'])
+
+def parse_event(line: str):
+    """Parses 'park <reg no> <color> <vehicle type> <entrance>' or 'leave <reg no>' into a tuple."""
+    fields = line.split()
+    if not fields:
+        return None
+    action = fields[0].lower()
+    if action == 'park' and len(fields) == 5:
+        return action, fields[1], fields[2], int(fields[3]), int(fields[4])
+    if action == 'leave' and len(fields) == 2:
+        return action, fields[1]
+    raise ValueError(f"Cannot parse event {line.strip()!r}")
+
+def read_events(path: str) -> Iterator[str]:
+    """Lazily yields event lines from a file. Blank lines and '#' comments are skipped."""
+    with open(path) as events:
+        for line in events:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def replay(parking_lot: ParkingLot, events: Iterable[Union[tuple, str]]) -> Iterator[EventResult]:
+    """Streams events through park and leave, yielding one EventResult per event.
+
+    Events are tuples as produced by parse_event or raw lines. Nothing is buffered,
+    so memory does not depend on the length of the stream.
+    """
+    for event in events:
+        if isinstance(event, str):
+            try:
+                event = parse_event(event)
+            except ValueError as error:
+                yield EventResult(None, None, None, None, str(error))
+                continue
+            if event is None:
+                continue
+
+        action, reg_no = event[0], event[1]
+        try:
+            if action == 'park':
+                _, _, color, vehicle_type, entrance_no = event
+                spot = parking_lot.assign_spot(reg_no, color, vehicle_type, entrance_no)
+                yield EventResult(action, reg_no, (spot.get_x(), spot.get_y()), None, None)
+            elif action == 'leave':
+                spot, fee = parking_lot.release_spot(reg_no)
+                yield EventResult(action, reg_no, (spot.get_x(), spot.get_y()), fee, None)
+            else:
+                yield EventResult(action, reg_no, None, None, f"Unknown action {action}")
+        except ValueError as error:
+            yield EventResult(action, reg_no, None, None, str(error))
@@ -0,0 +1,101 @@
+'''
+An asyncio server that lets gate terminals share one ParkingLot over a local socket.
+
+Requests and responses are single lines:
+
+    P <reg no> <color> <vehicle type> <entrance>  ->  OK <x> <y>
+    L <reg no>                                    ->  OK <fee>
+    W <reg no>                                    ->  OK <x> <y>
+    C <color>                                     ->  OK <reg no>,<reg no>,...
+    anything that fails                           ->  ERR <reason>
+
+Clients may pipeline any number of requests. Every request that has arrived by
+the time the connection is read is handled in one pass and answered with a
+single write.
+'''
+from parking_lot import ParkingLot
+import argparse
+import asyncio
+
+class GateServer:
+
+    def __init__(self, parking_lot: ParkingLot):
+        self.parking_lot = parking_lot
+
+    def handle_line(self, line: str, color_cache: dict):
+        fields = line.split()
+        if not fields:
+            return "ERR empty request"
+        command = fields[0]
+        try:
+            if command == "P" and len(fields) == 5:
+                color_cache.clear()
+                spot = self.parking_lot.assign_spot(fields[1], fields[2], int(fields[3]), int(fields[4]))
+                return f"OK {spot.get_x()} {spot.get_y()}"
+            if command == "L" and len(fields) == 2:
+                color_cache.clear()
+                _, fee = self.parking_lot.release_spot(fields[1])
+                return f"OK {fee:.4f}"
+            if command == "W" and len(fields) == 2:
+                spot_index = self.parking_lot.assigned_spots.get(fields[1])
+                if spot_index is None:
+                    return f"ERR Vehicle with the registration number {fields[1]} was not parked"
+                table = self.parking_lot.spot_table
+                return f"OK {table.x[spot_index]} {table.y[spot_index]}"
+            if command == "C" and len(fields) == 2:
+                # repeated color queries in one batch share a result until the next park or leave
+                if fields[1] not in color_cache:
+                    color_cache[fields[1]] = "OK " + ",".join(self.parking_lot.get_registration_numbers(fields[1]))
+                return color_cache[fields[1]]
+        except ValueError as error:
+            return f"ERR {error}"
+        return f"ERR Cannot parse request {line.strip()!r}"
+
+    def handle_request(self, line: bytes, color_cache: dict):
+        try:
+            text = line.decode()
+        except UnicodeDecodeError:
+            return "ERR Requests must be UTF-8"
+        return self.handle_line(text, color_cache)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(1 << 16)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b"\n")
+                if not lines:
+                    continue
+                color_cache = {}
+                responses = [self.handle_request(line, color_cache) for line in lines]
+                writer.write(("\n".join(responses) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 7070, unix_path: str = None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path, backlog=1024)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--spots", type=int, default=10000)
+    parser.add_argument("--rate", type=int, default=5)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--unix", help="listen on a unix socket at this path instead of tcp")
+    args = parser.parse_args()
+
+    parking_lot = ParkingLot(args.spots, args.rate, entrances=[(0, 0), (0, 100), (100, 0), (100, 100)])
+    asyncio.run(GateServer(parking_lot).serve(args.host, args.port, args.unix))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""This module defines an addressable min-heap over a fixed range of integer keys."""
+from array import array
+from typing import Iterable
+
+
+class IndexedHeap:
+    """A binary min-heap of integer keys in [0, capacity) ordered by (priority, key).
+
+    Every key is stored at most once and its position is tracked, so membership
+    checks are O(1) and removal of an arbitrary key is O(log n).
+    """
+
+    def __init__(self, capacity: int):
+        self._priorities = array('d', [0.0]) * capacity
+        self._positions = array('l', [-1]) * capacity
+        self._heap = array('l')
+
+    @classmethod
+    def from_items(cls, keys: Iterable[int], priorities: Iterable[float], capacity: int):
+        """Builds a heap holding all given keys.
+
+        The items are sorted once, which is done in C and is already a valid heap
+        layout, instead of sifting every key into place from Python.
+        """
+        heap = cls(capacity)
+        items = sorted(zip(priorities, keys))
+        heap._heap = array('l', [key for _, key in items])
+        for position, (priority, key) in enumerate(items):
+            heap._priorities[key] = priority
+            heap._positions[key] = position
+        return heap
+
+    @classmethod
+    def from_arrays(cls, heap_keys: array, priorities: array, positions: array):
+        """Wraps prebuilt arrays without copying.
+
+        heap_keys must already be in heap order (a sorted order is fine), priorities
+        holds the priority of every key in [0, capacity) and positions maps each key
+        to its index in heap_keys, or -1 if the key is absent.
+        """
+        heap = cls(0)
+        heap._heap = heap_keys
+        heap._priorities = priorities
+        heap._positions = positions
+        return heap
+
+    @classmethod
+    def from_priorities(cls, keys: Iterable[int], priorities: array):
+        """Builds a heap holding the given keys in one pass, ordered by an existing priorities array.
+
+        priorities holds the priority of every key in [0, capacity) and is used without
+        copying. Like from_items, the keys are sorted in C rather than pushed one by one.
+        """
+        heap = cls(0)
+        ordered = sorted(keys)
+        # a stable sort by priority keeps equal priorities in key order
+        ordered.sort(key=priorities.__getitem__)
+        heap._heap = array('l', ordered)
+        heap._priorities = priorities
+        heap._positions = positions = array('l', [-1]) * len(priorities)
+        for position, key in enumerate(ordered):
+            positions[key] = position
+        return heap
+
+    def to_arrays(self):
+        """Returns the (heap_keys, priorities, positions) arrays accepted by from_arrays."""
+        return self._heap, self._priorities, self._positions
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, key: int):
+        return self._positions[key] != -1
+
+    def priority(self, key: int):
+        return self._priorities[key]
+
+    def set_priority(self, key: int, priority: float):
+        """Sets the priority a key will be ordered by the next time it is pushed."""
+        if key in self:
+            raise ValueError(f"Key {key} is already in the heap")
+        self._priorities[key] = priority
+
+    def peek(self):
+        if not self._heap:
+            raise IndexError("peek from an empty heap")
+        return self._heap[0]
+
+    def push(self, key: int, priority: float = None):
+        """Adds a key to the heap. Returns False if the key was already present."""
+        if key in self:
+            return False
+        if priority is not None:
+            self._priorities[key] = priority
+        self._positions[key] = len(self._heap)
+        self._heap.append(key)
+        self._sift_up(len(self._heap) - 1)
+        return True
+
+    def pop(self):
+        if not self._heap:
+            raise IndexError("pop from an empty heap")
+        key = self._heap[0]
+        self._remove_at(0)
+        return key
+
+    def remove(self, key: int):
+        """Removes a key from the heap. Returns False if the key was not present."""
+        position = self._positions[key]
+        if position == -1:
+            return False
+        self._remove_at(position)
+        return True
+
+    def _remove_at(self, position: int):
+        heap = self._heap
+        removed = heap[position]
+        last = heap.pop()
+        self._positions[removed] = -1
+        if position < len(heap):
+            heap[position] = last
+            self._positions[last] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last])
+
+    def _less(self, key1: int, key2: int):
+        priority1 = self._priorities[key1]
+        priority2 = self._priorities[key2]
+        return priority1 < priority2 or (priority1 == priority2 and key1 < key2)
+
+    def _sift_up(self, position: int):
+        heap, positions = self._heap, self._positions
+        key = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            parent_key = heap[parent]
+            if not self._less(key, parent_key):
+                break
+            heap[position] = parent_key
+            positions[parent_key] = position
+            position = parent
+        heap[position] = key
+        positions[key] = position
+
+    def _sift_down(self, position: int):
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        key = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._less(heap[child + 1], heap[child]):
+                child += 1
+            child_key = heap[child]
+            if not self._less(child_key, key):
+                break
+            heap[position] = child_key
+            positions[child_key] = position
+            position = child
+        heap[position] = key
+        positions[key] = position
@@ -0,0 +1,81 @@
+'''
+Simulates many gate terminals against a running gate_server.py and reports
+requests per second and latency percentiles.
+
+    python gate_server.py --spots 50000 &
+    python load_generator.py --gates 300 --requests 200 --pipeline 8
+'''
+import argparse
+import asyncio
+import random
+import time
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run_gate(gate: int, args, latencies: list, errors: list):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit=1 << 24)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=1 << 24)
+    rng = random.Random(gate)
+    parked = []
+    sent_at = []
+
+    async def receive(count: int):
+        for _ in range(count):
+            response = await reader.readline()
+            latencies.append(time.perf_counter() - sent_at.pop(0))
+            if response.startswith(b"ERR"):
+                errors.append(response)
+
+    for counter in range(0, args.requests, args.pipeline):
+        batch = []
+        for offset in range(min(args.pipeline, args.requests - counter)):
+            roll = rng.random()
+            if parked and roll < 0.35:
+                batch.append(f"L {parked.pop(rng.randrange(len(parked)))}")
+            elif parked and roll < 0.5:
+                batch.append(f"W {rng.choice(parked)}")
+            elif roll < 0.55:
+                batch.append(f"C {rng.choice(['red', 'blue', 'white'])}")
+            else:
+                reg_no = f"G{gate}-{counter + offset}"
+                parked.append(reg_no)
+                batch.append(f"P {reg_no} {rng.choice(['red', 'blue', 'white'])} {rng.randint(1, 3)} {gate % 4 + 1}")
+        now = time.perf_counter()
+        sent_at.extend([now] * len(batch))
+        writer.write(("\n".join(batch) + "\n").encode())
+        await receive(len(batch))
+
+    for reg_no in parked:
+        writer.write(f"L {reg_no}\n".encode())
+    sent_at.extend([time.perf_counter()] * len(parked))
+    await receive(len(parked))
+    writer.close()
+    await writer.wait_closed()
+
+async def run(args):
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_gate(gate, args, latencies, errors) for gate in range(args.gates)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{len(latencies)} requests from {args.gates} gates in {elapsed:.2f}s: {len(latencies) / elapsed:.0f} req/s")
+    print(f"latency p50 {percentile(latencies, 0.5) * 1e3:.2f}ms, p99 {percentile(latencies, 0.99) * 1e3:.2f}ms, "
+          f"max {latencies[-1] * 1e3:.2f}ms")
+    print(f"{len(errors)} rejected requests")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7070)
+    parser.add_argument("--unix", help="connect to a unix socket at this path instead of tcp")
+    parser.add_argument("--gates", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=200, help="requests per gate")
+    parser.add_argument("--pipeline", type=int, default=8, help="requests in flight per gate")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,17 @@
 '''
+Pass a file of gate events as the first argument to replay it instead of using the interactive shell.
 '''
+from event_stream import read_events, replay
 from parking_lot import ParkingLot
+import sys
 
 parking_lot = ParkingLot(20, 5)
 
+if len(sys.argv) > 1:
+    for result in replay(parking_lot, read_events(sys.argv[1])):
+        print(result)
+    sys.exit()
+
 while True:
     print("Choose your input")
     print("1: Park Vehicle")
@@ -1,29 +1,91 @@
 from entrance import Entrance
+from distance_matrix import has_numpy, compute_distance_matrix, build_heaps
 from vehicle import Vehicle
 from parking_spot import ParkingSpot
+from parking_stats import ParkingStats
+from spot_table import SpotTable
 from type import Type
-from typing import List, Dict
+from typing import Dict, List, Tuple
+from collections import defaultdict
+from datetime import datetime
+from contextlib import nullcontext
 import math
+import threading
 
 class ParkingLot:
 
-    def __init__(self, total_spots: int, parking_rate: int, entrances: list = [], parking_spots: list = []):
-        self.parking_spots: List[ParkingSpot] = []
-        self.entrances: Dict[int, Entrance] = {}
-        self.assigned_spots: Dict[str, ParkingSpot] = {}
-        self.parking_rate = parking_rate
+    def __init__(self, total_spots: int, parking_rate: int, entrances: list = [], parking_spots: list = [],
+                 vectorized: bool = True, thread_safe: bool = False):
+        self._setup(SpotTable(), parking_rate, thread_safe)
         
         if parking_spots == []:
             self.generateParkingSpots(total_spots)
         else:
             for spot_type, x, y in parking_spots:
-                self.parking_spots.append(ParkingSpot(spot_type=spot_type, x=x, y=y))
+                self.spot_table.append(spot_type=spot_type, x=x, y=y)
         
         if entrances == []:
-            self.entrances[1] = Entrance(0, 0, parking_spots=self.parking_spots)
+            entrances = [(0, 0)]
+
+        if vectorized and has_numpy():
+            # one batched distance computation for every entrance instead of a per-spot loop each
+            distances = compute_distance_matrix(entrances, self.spot_table)
+            for index, entrance in enumerate(entrances):
+                heaps = build_heaps(distances[index], self.spot_table)
+                self.entrances[index+1] = Entrance(entrance[0], entrance[1], parking_spots=self.spot_table, heaps=heaps)
         else:
             for index, entrance in enumerate(entrances):
-                self.entrances[index+1] = Entrance(entrance[0], entrance[1], parking_spots=self.parking_spots)
+                self.entrances[index+1] = Entrance(entrance[0], entrance[1], parking_spots=self.spot_table)
+
+    @classmethod
+    def from_state(cls, spot_table: SpotTable, entrances: Dict[int, Entrance], parking_rate: int, thread_safe: bool = False):
+        """Wraps an already built spot table and entrances, e.g. ones loaded from a snapshot.
+
+        Vehicles parked in the table are registered again, which costs time proportional
+        to the number of parked vehicles rather than the lot size.
+        """
+        parking_lot = cls.__new__(cls)
+        parking_lot._setup(spot_table, parking_rate, thread_safe)
+        parking_lot.entrances.update(entrances)
+        for _, spot_index in spot_table.parked_vehicles():
+            parking_lot._register(spot_table.get_vehicle(spot_index), spot_index)
+        return parking_lot
+
+    def _setup(self, spot_table: SpotTable, parking_rate: int, thread_safe: bool):
+        self.spot_table = spot_table
+        self.entrances: Dict[int, Entrance] = {}
+        # reg_no -> index of the spot in spot_table
+        self.assigned_spots: Dict[str, int] = {}
+        # reg_nos whose spot is being claimed, so a second gate cannot park the same vehicle meanwhile
+        self._arriving = set()
+        self.parking_rate = parking_rate
+        # color -> reg_no -> spot index and (color, vehicle type) -> reg_no -> spot index, kept in sync by park and leave
+        self._color_index: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._color_type_index: Dict[Tuple[str, str], Dict[str, int]] = defaultdict(dict)
+        # thread_safe is for correctness only: gate threads sharing one lot never get the
+        # same spot, but they still take turns on the interpreter, so adding threads does
+        # not add throughput. To scale with gates, give each gate its own shard process
+        # (see sharded_lot.py). A spot only ever sits in the heaps of its own type, so
+        # claims take that type's lock; the registry lock guards assigned_spots and the
+        # color indexes.
+        self._type_locks = {spot_type: threading.Lock() if thread_safe else nullcontext()
+                            for spot_type in Type.get_types().values()}
+        self._registry_lock = threading.Lock() if thread_safe else nullcontext()
+        # optional write-ahead journal, see persistence.py
+        self.journal = None
+        # updated under the registry lock
+        self.stats = ParkingStats()
+
+    def free_capacity(self):
+        """Returns the number of free spots per spot type in O(1) per type."""
+        # every entrance holds the same free spots, so any one of them can answer
+        entrance = next(iter(self.entrances.values()))
+        return {spot_type: len(heap) for spot_type, heap in entrance.closest_spots_based_on_type.items()}
+
+    @property
+    def parking_spots(self) -> List[ParkingSpot]:
+        """Returns every spot, in index order, as ParkingSpot views over the spot table."""
+        return list(self.spot_table)
         
     def generateParkingSpots(self, total_spots: int):
         root = math.floor(math.sqrt(total_spots))
@@ -32,24 +94,96 @@ class ParkingLot:
             for y in range(1, root+1):
                 spot_type = counter%3 + 1
                 counter += 1
-                self.parking_spots.append(ParkingSpot(spot_type=spot_type, x=x, y=y))
+                self.spot_table.append(spot_type=spot_type, x=x, y=y)
 
         remaining = total_spots - (root * root)
         for y in range(remaining):
             spot_type = counter%3 + 1
             counter += 1
-            self.parking_spots.append(ParkingSpot(spot_type=spot_type, x=(root+1), y=y))
+            self.spot_table.append(spot_type=spot_type, x=(root+1), y=y)
     
-    def park(self, reg_no, color, vehicle_type, entrance_no):
+    def assign_spot(self, reg_no: str, color: str, vehicle_type: int, entrance_no: int):
+        """Parks a vehicle without any console output and returns its spot. Raises ValueError when it cannot park."""
+        if entrance_no not in self.entrances:
+            raise ValueError(f"Entrance {entrance_no} does not exist")
+        if vehicle_type not in Type.get_types():
+            raise ValueError(f"Vehicle type {vehicle_type} does not exist")
         entrance = self.entrances[entrance_no]
 
+        self._check_not_parked(reg_no, claim=True)
+
+        vehicle = Vehicle(registration_no=reg_no, color=color, vechile_type=vehicle_type)
         try:
+            with self._type_locks[vehicle.get_type()]:
+                empty_spot = entrance.get_closest_available_spot(type_of=Type(vehicle_type))
+                self._occupy(empty_spot, vehicle, entrance_no, datetime.now())
+            self._register(vehicle, empty_spot.get_index())
+        finally:
+            with self._registry_lock:
+                self._arriving.discard(reg_no)
+        return empty_spot
+
+    def restore_spot(self, reg_no: str, color: str, vehicle_type: int, entrance_no: int, spot_index: int, timestamp: datetime):
+        """Parks a vehicle at a known spot and entry time, used when replaying a journal."""
+        self._check_not_parked(reg_no)
+        spot = self.spot_table[spot_index]
+        if not spot.is_available():
+            raise ValueError(f"Spot {spot.get_x()}, {spot.get_y()} is already occupied")
+        vehicle = Vehicle(registration_no=reg_no, color=color, vechile_type=vehicle_type)
+        with self._type_locks[spot.get_type()]:
+            self._occupy(spot, vehicle, entrance_no, timestamp)
+        self._register(vehicle, spot_index)
+        return spot
+
+    def _check_not_parked(self, reg_no: str, claim: bool = False):
+        with self._registry_lock:
+            if reg_no in self.assigned_spots or reg_no in self._arriving:
+                raise ValueError(f"Vehicle with the registration number {reg_no} is already parked")
+            if claim:
+                self._arriving.add(reg_no)
 
-            empty_spot = entrance.get_closest_available_spot(type_of=Type(vehicle_type))
-            vehicle = Vehicle(registration_no=reg_no, color=color, vechile_type=vehicle_type)
-            empty_spot.assign_parking_spot(vehicle=vehicle)
-            self.assigned_spots[reg_no] = empty_spot
+    def _occupy(self, spot: ParkingSpot, vehicle: Vehicle, entrance_no: int, timestamp: datetime):
+        # called with the spot type's lock held, so journal order matches the order spots were claimed in
+        for entrance in self.entrances.values():
+            entrance.remove_parking_spot(spot)
+        spot.assign_parking_spot(vehicle=vehicle, timestamp=timestamp, entrance_no=entrance_no)
+        if self.journal:
+            self.journal.record_park(vehicle, entrance_no, spot.get_index(), timestamp)
+
+    def _register(self, vehicle: Vehicle, spot_index: int):
+        with self._registry_lock:
+            self.assigned_spots[vehicle.get_registration_number()] = spot_index
+            self._add_to_indexes(vehicle.get_registration_number(), vehicle.get_color(), vehicle.get_type(), spot_index)
+            self.stats.record_park(Type.types[self.spot_table.type_codes[spot_index]], self.spot_table.entrance_nos[spot_index])
+
+    def release_spot(self, reg_no: str):
+        """Frees the spot of a vehicle without any console output and returns (spot, fee). Raises ValueError for unknown vehicles."""
+        # taking the ticket out of the registry first means only one gate can release the spot
+        with self._registry_lock:
+            spot_index = self.assigned_spots.pop(reg_no, None)
+            if spot_index is None:
+                raise ValueError(f"Vehicle with the registration number {reg_no} was not parked")
+            spot = self.spot_table[spot_index]
+            vehicle = spot.get_parked_vehicle()
+            self._remove_from_indexes(reg_no, vehicle.get_color(), vehicle.get_type())
+        spot_type = spot.get_type()
+        with self._type_locks[spot_type]:
+            entry_time, entrance_no = self.spot_table.timestamps[spot_index], spot.get_entrance_no()
+            leaving_timestamp = datetime.now()
+            fee = spot.empty_parking_spot(parking_rate=self.parking_rate, leaving_timestamp=leaving_timestamp)
+            for entrance in self.entrances.values():
+                entrance.add_parking_spot(spot)
+            if self.journal:
+                self.journal.record_leave(reg_no)
+        with self._registry_lock:
+            self.stats.record_leave(spot_type, entrance_no, entry_time, leaving_timestamp.timestamp(), fee)
+        return spot, fee
+
+    def park(self, reg_no, color, vehicle_type, entrance_no):
+        try:
+            empty_spot = self.assign_spot(reg_no=reg_no, color=color, vehicle_type=vehicle_type, entrance_no=entrance_no)
             print(f"Pleae park at {empty_spot.get_x()}, {empty_spot.get_y()}")
+            return empty_spot
 
         except ValueError as error:
             print(error)
@@ -58,34 +192,36 @@ class ParkingLot:
         if reg_no not in self.assigned_spots:
             print(f"Vehicle with the registration number {reg_no} was not parked")
         
-        spot = self.assigned_spots[reg_no]
+        spot = self.spot_table[self.assigned_spots[reg_no]]
         print(f"Vehicle is parked at {spot.get_x()}, {spot.get_y()}")
         return spot
     
     def leave(self, reg_no: str):
-        spot = self.get_parking_slot(reg_no=reg_no)
-        fee = spot.empty_parking_spot(parking_rate=self.parking_rate)
-        for entrance in self.entrances.values():
-            entrance.add_parking_spot(spot)
-        del self.assigned_spots[reg_no]
+        self.get_parking_slot(reg_no=reg_no)
+        _, fee = self.release_spot(reg_no=reg_no)
         print(f"Please make a payment of {fee}")
     
-    def get_slot_numbers(self, color:str):
-        spots_with_same_color = []
-        for spot in self.assigned_spots.values():
-            vehicle = spot.get_parked_vehicle()
-            if vehicle.get_color() == color:
-                spots_with_same_color.append((spot.get_x(), spot.get_y()))
-        
-        return spots_with_same_color
-    
-    def get_registration_numbers(self, color:str):
-        vehicles_with_same_color = []
-        for spot in self.assigned_spots.values():
-            vehicle = spot.get_parked_vehicle()
-            if vehicle.get_color() == color:
-                vehicles_with_same_color.append(vehicle.get_registration_number())
-        
-        return vehicles_with_same_color
+    def _add_to_indexes(self, reg_no: str, color: str, vehicle_type: str, spot_index: int):
+        self._color_index[color][reg_no] = spot_index
+        self._color_type_index[(color, vehicle_type)][reg_no] = spot_index
+
+    def _remove_from_indexes(self, reg_no: str, color: str, vehicle_type: str):
+        for index, key in ((self._color_index, color), (self._color_type_index, (color, vehicle_type))):
+            bucket = index[key]
+            del bucket[reg_no]
+            if not bucket:
+                del index[key]
+
+    def _spots_with_color(self, color: str, vehicle_type: int = None):
+        if vehicle_type is None:
+            return self._color_index.get(color, {})
+        return self._color_type_index.get((color, Type(vehicle_type).get_type()), {})
+
+    def get_slot_numbers(self, color:str, vehicle_type: int = None):
+        table = self.spot_table
+        with self._registry_lock:
+            return [(table.x[index], table.y[index]) for index in self._spots_with_color(color, vehicle_type).values()]
     
-    
\ No newline at end of file
+    def get_registration_numbers(self, color:str, vehicle_type: int = None):
+        with self._registry_lock:
+            return list(self._spots_with_color(color, vehicle_type))
@@ -1,31 +1,77 @@
 """This module defines the parking spot class."""
 from datetime import datetime
 from type import Type
-from coordinates import Coordinates
 from vehicle import Vehicle
 
-class ParkingSpot(Type, Coordinates):
-    def __init__(self, spot_type: Type, x: int, y: int, timestamp=None, parked_vechile: Vehicle = None):
-        super().__init__(spot_type)
-        Coordinates.__init__(self, x, y)
-        self._timestamp = timestamp
-        self._parked_vechile = parked_vechile
+class ParkingSpot:
+    """A lightweight view over one row of a SpotTable.
+
+    Constructed directly, a spot gets a one-row table of its own.
+    """
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, spot_type: int, x: int, y: int, timestamp: datetime = None, parked_vechile: Vehicle = None):
+        from spot_table import SpotTable
+        if isinstance(spot_type, Type):
+            spot_type = spot_type.get_type_code()
+        self._table = SpotTable()
+        self._index = self._table.append(spot_type, x, y)
+        if parked_vechile is not None:
+            self.assign_parking_spot(parked_vechile, timestamp)
+        elif timestamp is not None:
+            self.set_timestamp(timestamp)
+
+    @classmethod
+    def view(cls, table, index: int):
+        """Returns a spot backed by row index of table."""
+        spot = cls.__new__(cls)
+        spot._table = table
+        spot._index = index
+        return spot
+
+    def get_index(self):
+        return self._index
+
+    def get_x(self):
+        return self._table.x[self._index]
+
+    def get_y(self):
+        return self._table.y[self._index]
+
+    def set_x(self, x: int):
+        self._table.x[self._index] = x
+
+    def set_y(self, y: int):
+        self._table.y[self._index] = y
+
+    def get_type(self):
+        return Type.types[self._table.type_codes[self._index]]
+
+    def get_type_code(self):
+        return self._table.type_codes[self._index]
 
     def is_available(self):
-        return not self._parked_vechile
+        return not self._table.occupied[self._index]
     
     def get_timestamp(self):
-        return self._timestamp
+        timestamp = self._table.timestamps[self._index]
+        return datetime.fromtimestamp(timestamp) if timestamp else None
     
     def set_timestamp(self, timestamp: datetime):
-        self._timestamp = timestamp
+        self._table.timestamps[self._index] = timestamp.timestamp() if timestamp else 0.0
 
-    def assign_parking_spot(self, vehicle: Vehicle):
-        self.set_timestamp(datetime.now())
-        self._parked_vechile = vehicle
+    def assign_parking_spot(self, vehicle: Vehicle, timestamp: datetime = None, entrance_no: int = 0):
+        if vehicle is None:
+            self._table.release(self._index)
+            return
+        self._table.assign(self._index, vehicle, (timestamp or datetime.now()).timestamp(), entrance_no)
+
+    def get_entrance_no(self):
+        return self._table.entrance_nos[self._index]
     
     def get_parked_vehicle(self):
-        return self._parked_vechile
+        return self._table.get_vehicle(self._index)
     
     def compute_parking_fee(self, leaving_timestamp: datetime, parking_rate: float):
         time_parked = leaving_timestamp - self.get_timestamp()
@@ -33,11 +79,16 @@ class ParkingSpot(Type, Coordinates):
 
         return parking_rate * total_hours
     
-    def empty_parking_spot(self, parking_rate: float):
-        fee = self.compute_parking_fee(datetime.now(), parking_rate)
-        self.set_timestamp(None)
-        self.assign_parking_spot(None)
+    def empty_parking_spot(self, parking_rate: float, leaving_timestamp: datetime = None):
+        fee = self.compute_parking_fee(leaving_timestamp or datetime.now(), parking_rate)
+        self._table.release(self._index)
         return fee
+
+    def __eq__(self, other):
+        return isinstance(other, ParkingSpot) and self._table is other._table and self._index == other._index
+
+    def __hash__(self):
+        return hash(self._index)
     
     def __lt__(self, other):
-        return self.get_x() < other.get_x()
\ No newline at end of file
+        return self.get_x() < other.get_x()
@@ -0,0 +1,69 @@
+"""This module keeps rolling revenue, occupancy and dwell-time aggregates for a ParkingLot."""
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, List, Tuple
+
+class ParkingStats:
+    """Aggregates updated in O(1) per park and leave, so queries never scan spots or logs.
+
+    Revenue is bucketed by the hour a vehicle left in and only the most recent
+    retention_hours buckets are kept.
+    """
+
+    # upper bounds of the dwell-time histogram buckets, in minutes; the last bucket is open ended
+    DWELL_BUCKETS = (15, 30, 60, 120, 240, 480, 1440)
+
+    def __init__(self, retention_hours: int = 24 * 7):
+        self.retention_hours = retention_hours
+        self._revenue_by_hour: Dict[int, float] = {}
+        self._occupancy_by_type: Counter = Counter()
+        self._occupancy_by_entrance: Counter = Counter()
+        self._dwell_counts = array('q', [0]) * (len(self.DWELL_BUCKETS) + 1)
+        self._total_dwell_seconds = 0.0
+        self._total_revenue = 0.0
+        self._departures = 0
+
+    def record_park(self, spot_type: str, entrance_no: int):
+        self._occupancy_by_type[spot_type] += 1
+        self._occupancy_by_entrance[entrance_no] += 1
+
+    def record_leave(self, spot_type: str, entrance_no: int, entry_time: float, exit_time: float, fee: float):
+        self._occupancy_by_type[spot_type] -= 1
+        self._occupancy_by_entrance[entrance_no] -= 1
+
+        hour = int(exit_time // 3600)
+        revenue_by_hour = self._revenue_by_hour
+        if hour not in revenue_by_hour:
+            revenue_by_hour[hour] = 0.0
+            # hours are created in time order, so the first key is always the oldest
+            if len(revenue_by_hour) > self.retention_hours:
+                del revenue_by_hour[next(iter(revenue_by_hour))]
+        revenue_by_hour[hour] += fee
+        self._total_revenue += fee
+
+        dwell_seconds = max(exit_time - entry_time, 0.0)
+        self._dwell_counts[bisect_right(self.DWELL_BUCKETS, dwell_seconds / 60)] += 1
+        self._total_dwell_seconds += dwell_seconds
+        self._departures += 1
+
+    def total_revenue(self):
+        return self._total_revenue
+
+    def revenue_by_hour(self) -> List[Tuple[int, float]]:
+        """Returns (hour start as a unix timestamp, revenue) for each retained hour, oldest first."""
+        return [(hour * 3600, revenue) for hour, revenue in self._revenue_by_hour.items()]
+
+    def occupancy_by_type(self) -> Dict[str, int]:
+        return {spot_type: count for spot_type, count in self._occupancy_by_type.items() if count}
+
+    def occupancy_by_entrance(self) -> Dict[int, int]:
+        return {entrance_no: count for entrance_no, count in self._occupancy_by_entrance.items() if count}
+
+    def dwell_histogram(self) -> List[Tuple[str, int]]:
+        """Returns (bucket label, departures) pairs, e.g. ('<15m', 4)."""
+        labels = [f"<{bound}m" for bound in self.DWELL_BUCKETS] + [f">={self.DWELL_BUCKETS[-1]}m"]
+        return list(zip(labels, self._dwell_counts))
+
+    def average_dwell_seconds(self):
+        return self._total_dwell_seconds / self._departures if self._departures else 0.0
@@ -0,0 +1,229 @@
+"""This module makes ParkingLot state durable with compact snapshots and a write-ahead journal.
+
+A snapshot stores the SpotTable columns and every entrance's heap arrays as raw
+bytes, so loading one is a handful of array reads rather than a rebuild. The
+journal records every park and leave made after the snapshot, each tagged with a
+sequence number, and is replayed on top of the snapshot when the lot is loaded.
+Journal records are JSON arrays, so registration numbers and colors may hold any
+character.
+"""
+from array import array
+from datetime import datetime
+from entrance import Entrance
+from indexed_heap import IndexedHeap
+from parking_lot import ParkingLot
+from spot_table import SpotTable
+from type import Type
+from vehicle import Vehicle
+import json
+import os
+import threading
+
+MAGIC = b"PLOTSNAP1\n"
+
+class Journal:
+    """An append-only log of park and leave operations, one JSON array per line."""
+
+    def __init__(self, path: str, sequence: int = 0, sync: bool = False):
+        self.path = path
+        self.sequence = sequence
+        self.sync = sync
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def record_park(self, vehicle: Vehicle, entrance_no: int, spot_index: int, timestamp: datetime):
+        self._append("P", timestamp.timestamp(), spot_index, entrance_no, vehicle.get_type_code(),
+                     vehicle.get_registration_number(), vehicle.get_color())
+
+    def record_leave(self, reg_no: str):
+        self._append("L", reg_no)
+
+    def _append(self, *fields):
+        with self._lock:
+            self.sequence += 1
+            self._file.write(json.dumps([self.sequence, *fields]) + "\n")
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+
+    def truncate(self):
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    @staticmethod
+    def read(path: str, after: int = 0):
+        """Yields (sequence, fields) for every complete record with a sequence number above after."""
+        if not os.path.exists(path):
+            return
+        with open(path) as journal:
+            for line in journal:
+                # a torn final write has no newline and is ignored
+                if not line.endswith("\n"):
+                    break
+                sequence, *fields = json.loads(line)
+                if sequence > after:
+                    yield sequence, fields
+
+def save_snapshot(parking_lot: ParkingLot, path: str, sequence: int = 0):
+    """Writes the lot atomically to path. sequence is the last journal record the snapshot includes."""
+    table = parking_lot.spot_table
+    sections = [("x", table.x), ("y", table.y), ("type_codes", table.type_codes),
+                ("type_ranks", table.type_ranks), ("timestamps", table.timestamps)]
+    for type_code, indexes in table.spots_by_type.items():
+        sections.append((f"spots_by_type/{type_code}", indexes))
+    entrances = []
+    for entrance_no, entrance in parking_lot.entrances.items():
+        entrances.append([entrance_no, entrance.get_x(), entrance.get_y()])
+        for spot_type, heap in entrance.closest_spots_based_on_type.items():
+            prefix = f"entrance/{entrance_no}/{spot_type}"
+            heap_keys, priorities, positions = heap.to_arrays()
+            sections += [(f"{prefix}/heap", heap_keys), (f"{prefix}/priorities", priorities),
+                         (f"{prefix}/positions", positions)]
+
+    vehicles = []
+    for reg_no, spot_index in table.parked_vehicles():
+        vehicle = table.get_vehicle(spot_index)
+        vehicles.append([spot_index, reg_no, vehicle.get_color(), vehicle.get_type_code(), table.entrance_nos[spot_index]])
+    header = {
+        "sequence": sequence,
+        "parking_rate": parking_lot.parking_rate,
+        "entrances": entrances,
+        "vehicles": vehicles,
+        "sections": [[name, values.typecode, len(values)] for name, values in sections],
+    }
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as snapshot:
+        snapshot.write(MAGIC)
+        snapshot.write(json.dumps(header).encode() + b"\n")
+        for _, values in sections:
+            values.tofile(snapshot)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(temporary_path, path)
+
+def load_snapshot(path: str, thread_safe: bool = False, journal_path: str = None):
+    """Loads a lot written by save_snapshot. Returns (parking_lot, sequence).
+
+    When journal_path is given, the records after the snapshot are replayed onto the
+    spot table before the entrance heaps are built, so the heaps are rebuilt once in
+    bulk instead of being updated record by record. sequence is then the last record
+    replayed.
+    """
+    with open(path, "rb") as snapshot:
+        if snapshot.readline() != MAGIC:
+            raise ValueError(f"{path} is not a parking lot snapshot")
+        header = json.loads(snapshot.readline())
+        sections = {}
+        for name, typecode, length in header["sections"]:
+            values = array(typecode)
+            values.fromfile(snapshot, length)
+            sections[name] = values
+
+    table = SpotTable()
+    table.x, table.y = sections["x"], sections["y"]
+    table.type_codes, table.type_ranks = sections["type_codes"], sections["type_ranks"]
+    table.occupied = array('b', bytes(len(table.x)))
+    table.vehicle_ids = array('q', [SpotTable.NO_VEHICLE]) * len(table.x)
+    table.timestamps = array('d', bytes(8 * len(table.x)))
+    table.entrance_nos = array('h', bytes(2 * len(table.x)))
+    stored_timestamps = sections["timestamps"]
+    for name, values in sections.items():
+        if name.startswith("spots_by_type/"):
+            table.spots_by_type[int(name.split("/")[1])] = values
+    assigned_spots = {}
+    for spot_index, reg_no, color, type_code, entrance_no in header["vehicles"]:
+        vehicle = Vehicle(registration_no=reg_no, color=color, vechile_type=type_code)
+        table.assign(spot_index, vehicle, stored_timestamps[spot_index], entrance_no)
+        assigned_spots[reg_no] = spot_index
+
+    sequence = header["sequence"]
+    replayed = False
+    for sequence, fields in Journal.read(journal_path, after=sequence) if journal_path else ():
+        replayed = True
+        if fields[0] == "P":
+            _, timestamp, spot_index, entrance_no, type_code, reg_no, color = fields
+            if table.occupied[spot_index]:
+                raise ValueError(f"Journal record {sequence} parks {reg_no} at occupied spot {spot_index}")
+            if reg_no in assigned_spots:
+                raise ValueError(f"Journal record {sequence} parks {reg_no}, which was already parked")
+            table.assign(spot_index, Vehicle(registration_no=reg_no, color=color, vechile_type=type_code), timestamp,
+                         entrance_no)
+            assigned_spots[reg_no] = spot_index
+        else:
+            if fields[1] not in assigned_spots:
+                raise ValueError(f"Journal record {sequence} releases {fields[1]}, which was not parked")
+            table.release(assigned_spots.pop(fields[1]))
+
+    # the ranks of the free spots of each type, shared by every entrance's heap
+    free_ranks = {}
+    if replayed:
+        occupied = table.occupied
+        for type_code, indexes in table.spots_by_type.items():
+            free_ranks[type_code] = [rank for rank, index in enumerate(indexes) if not occupied[index]]
+
+    entrances = {}
+    for entrance_no, x, y in header["entrances"]:
+        heaps = {}
+        for type_code, spot_type in Type.get_types().items():
+            prefix = f"entrance/{entrance_no}/{spot_type}"
+            if f"{prefix}/heap" not in sections:
+                continue
+            if replayed:
+                heaps[type_code] = IndexedHeap.from_priorities(free_ranks[type_code], sections[f"{prefix}/priorities"])
+            else:
+                heaps[type_code] = IndexedHeap.from_arrays(sections[f"{prefix}/heap"], sections[f"{prefix}/priorities"],
+                                                           sections[f"{prefix}/positions"])
+        entrances[entrance_no] = Entrance(x, y, parking_spots=table, heaps=heaps)
+
+    parking_lot = ParkingLot.from_state(table, entrances, header["parking_rate"], thread_safe=thread_safe)
+    return parking_lot, sequence
+
+class ParkingLotStore:
+    """Keeps a lot durable in a directory holding one snapshot and one journal."""
+
+    def __init__(self, directory: str, sync: bool = False):
+        os.makedirs(directory, exist_ok=True)
+        self.snapshot_path = os.path.join(directory, "parking_lot.snapshot")
+        self.journal_path = os.path.join(directory, "parking_lot.journal")
+        self.sync = sync
+        self.journal = None
+
+    def attach(self, parking_lot: ParkingLot, sequence: int = 0):
+        """Starts journaling a lot's operations.
+
+        The lot is checkpointed first, so it can be loaded back even if it is never
+        checkpointed again, and records left over from an earlier lot are dropped.
+        """
+        self._resume(parking_lot, sequence)
+        self.checkpoint(parking_lot)
+
+    def _resume(self, parking_lot: ParkingLot, sequence: int):
+        self.journal = Journal(self.journal_path, sequence=sequence, sync=self.sync)
+        parking_lot.journal = self.journal
+
+    def checkpoint(self, parking_lot: ParkingLot):
+        """Writes a fresh snapshot and empties the journal it supersedes.
+
+        Should run while no gate is mutating the lot. If the process dies between the
+        two steps, the leftover records are skipped on load by their sequence numbers.
+        """
+        sequence = self.journal.sequence if self.journal else 0
+        save_snapshot(parking_lot, self.snapshot_path, sequence=sequence)
+        if self.journal:
+            self.journal.truncate()
+
+    def load(self, thread_safe: bool = False):
+        """Restores the lot from the snapshot and journal, then resumes journaling it."""
+        parking_lot, sequence = load_snapshot(self.snapshot_path, thread_safe=thread_safe, journal_path=self.journal_path)
+        self._resume(parking_lot, sequence)
+        return parking_lot
+
+    def close(self):
+        if self.journal:
+            self.journal.close()
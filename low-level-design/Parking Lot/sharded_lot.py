@@ -0,0 +1,165 @@
+"""This module splits a garage into shards, one ParkingLot per level or building, behind one coordinator."""
+from parking_lot import ParkingLot
+from type import Type
+from typing import Dict, List, Tuple
+import multiprocessing
+
+class LocalShard:
+    """Runs a shard's ParkingLot in the coordinator's process.
+
+    Shards only exchange plain values with the coordinator, so a ProcessShard can
+    stand in for a LocalShard without any other change.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.parking_lot = ParkingLot(*args, **kwargs)
+
+    def park(self, reg_no: str, color: str, vehicle_type: int, entrance_no: int):
+        spot = self.parking_lot.assign_spot(reg_no, color, vehicle_type, entrance_no)
+        return spot.get_x(), spot.get_y()
+
+    def leave(self, reg_no: str):
+        _, fee = self.parking_lot.release_spot(reg_no)
+        return fee
+
+    def locate(self, reg_no: str):
+        spot_index = self.parking_lot.assigned_spots.get(reg_no)
+        if spot_index is None:
+            raise ValueError(f"Vehicle with the registration number {reg_no} was not parked")
+        return self.parking_lot.spot_table.x[spot_index], self.parking_lot.spot_table.y[spot_index]
+
+    def registration_numbers(self, color: str, vehicle_type: int = None):
+        return self.parking_lot.get_registration_numbers(color, vehicle_type)
+
+    def free_capacity(self):
+        return self.parking_lot.free_capacity()
+
+    def close(self):
+        pass
+
+def _serve_shard(connection, args, kwargs):
+    shard = LocalShard(*args, **kwargs)
+    while True:
+        method, params = connection.recv()
+        if method is None:
+            break
+        try:
+            result = (True, getattr(shard, method)(*params))
+        except Exception as error:
+            # any failure goes back to the caller; the shard keeps serving
+            result = (False, error)
+        try:
+            connection.send(result)
+        except Exception as error:
+            connection.send((False, RuntimeError(f"{method} failed: {error!r}")))
+    connection.close()
+
+class ProcessShard:
+    """Runs a shard's ParkingLot in a worker process and forwards calls over a pipe."""
+
+    def __init__(self, *args, **kwargs):
+        self._connection, worker_connection = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve_shard, args=(worker_connection, args, kwargs), daemon=True)
+        self._process.start()
+
+    def _call(self, method: str, *params):
+        self._connection.send((method, params))
+        ok, result = self._connection.recv()
+        if not ok:
+            raise result
+        return result
+
+    def park(self, reg_no: str, color: str, vehicle_type: int, entrance_no: int):
+        return self._call("park", reg_no, color, vehicle_type, entrance_no)
+
+    def leave(self, reg_no: str):
+        return self._call("leave", reg_no)
+
+    def locate(self, reg_no: str):
+        return self._call("locate", reg_no)
+
+    def registration_numbers(self, color: str, vehicle_type: int = None):
+        return self._call("registration_numbers", color, vehicle_type)
+
+    def free_capacity(self):
+        return self._call("free_capacity")
+
+    def close(self):
+        self._connection.send((None, ()))
+        self._process.join()
+
+class ShardedParkingLot:
+    """Routes vehicles to the shard owning their entrance and falls back to the nearest shard with room.
+
+    entrances maps every global entrance number to (shard name, entrance number inside that shard).
+    shard_distances[a][b] is how far shard b is from shard a; fallback tries shards in that order.
+    Vehicles redirected to another shard enter it through its connector entrance (entrance 1 by default).
+    The coordinator keeps a free-capacity summary per shard and type, so full shards are never asked.
+    """
+
+    def __init__(self, shards: Dict[str, LocalShard], entrances: Dict[int, Tuple[str, int]],
+                 shard_distances: Dict[str, Dict[str, float]] = None, connectors: Dict[str, int] = None):
+        self.shards = shards
+        self.entrances = entrances
+        self.connectors = connectors or {}
+        self._free: Dict[str, Dict[str, int]] = {name: dict(shard.free_capacity()) for name, shard in shards.items()}
+        # reg_no -> (shard name, spot type)
+        self._shard_of: Dict[str, Tuple[str, str]] = {}
+
+        names = list(shards)
+        shard_distances = shard_distances or {}
+        self._fallback_order: Dict[str, List[str]] = {}
+        for name in names:
+            distances = shard_distances.get(name, {})
+            others = [other for other in names if other != name]
+            # shards without a known distance keep their declaration order after the known ones
+            self._fallback_order[name] = sorted(others, key=lambda other: (other not in distances, distances.get(other, 0)))
+
+    def park(self, reg_no: str, color: str, vehicle_type: int, entrance_no: int):
+        """Parks a vehicle and returns (shard name, x, y). Raises ValueError when no shard has room."""
+        if entrance_no not in self.entrances:
+            raise ValueError(f"Entrance {entrance_no} does not exist")
+        if reg_no in self._shard_of:
+            raise ValueError(f"Vehicle with the registration number {reg_no} is already parked")
+        if vehicle_type not in Type.get_types():
+            raise ValueError(f"Vehicle type {vehicle_type} does not exist")
+        spot_type = Type(vehicle_type).get_type()
+        home, local_entrance = self.entrances[entrance_no]
+
+        candidates = [(home, local_entrance)] + [(name, self.connectors.get(name, 1)) for name in self._fallback_order[home]]
+        for name, shard_entrance in candidates:
+            if self._free[name].get(spot_type, 0) <= 0:
+                continue
+            x, y = self.shards[name].park(reg_no, color, vehicle_type, shard_entrance)
+            self._free[name][spot_type] -= 1
+            self._shard_of[reg_no] = (name, spot_type)
+            return name, x, y
+
+        raise ValueError(f"No Parking Slots for type {spot_type} in any shard")
+
+    def leave(self, reg_no: str):
+        """Frees a vehicle's spot in whichever shard it was parked in and returns the fee."""
+        if reg_no not in self._shard_of:
+            raise ValueError(f"Vehicle with the registration number {reg_no} was not parked")
+        name, spot_type = self._shard_of[reg_no]
+        fee = self.shards[name].leave(reg_no)
+        del self._shard_of[reg_no]
+        self._free[name][spot_type] += 1
+        return fee
+
+    def locate(self, reg_no: str):
+        if reg_no not in self._shard_of:
+            raise ValueError(f"Vehicle with the registration number {reg_no} was not parked")
+        name, _ = self._shard_of[reg_no]
+        return (name, *self.shards[name].locate(reg_no))
+
+    def get_registration_numbers(self, color: str, vehicle_type: int = None):
+        return [reg_no for shard in self.shards.values() for reg_no in shard.registration_numbers(color, vehicle_type)]
+
+    def free_capacity(self):
+        """Returns the coordinator's free-spot summary, shard name -> spot type -> free spots."""
+        return {name: dict(free) for name, free in self._free.items()}
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
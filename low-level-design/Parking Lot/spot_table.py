@@ -0,0 +1,89 @@
+"""This module defines a struct-of-arrays table holding the state of every parking spot."""
+from array import array
+from typing import Dict, Tuple
+from itertools import count
+from parking_spot import ParkingSpot
+from vehicle import Vehicle
+
+class SpotTable:
+    """Stores spot coordinates, type codes, occupancy, entry timestamps and vehicle ids in typed arrays.
+
+    Spots are addressed by their index in the table. ParkingSpot views are only
+    created when a caller asks for one, and only parked vehicles are kept as objects.
+    """
+
+    NO_VEHICLE = -1
+
+    def __init__(self):
+        self.x = array('l')
+        self.y = array('l')
+        self.type_codes = array('b')
+        self.occupied = array('b')
+        self.timestamps = array('d')
+        self.vehicle_ids = array('q')
+        # entrance each parked vehicle came in through, 0 when the spot is free
+        self.entrance_nos = array('h')
+        # position of each spot among the spots of the same type
+        self.type_ranks = array('l')
+        self.spots_by_type: Dict[int, array] = {}
+        # vehicle id -> (spot index, vehicle), only for parked vehicles
+        self._vehicles: Dict[int, Tuple[int, Vehicle]] = {}
+        # next() on a count is atomic, so concurrent gates never share a vehicle id
+        self._vehicle_id_counter = count()
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("spot index out of range")
+        return ParkingSpot.view(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield ParkingSpot.view(self, index)
+
+    def append(self, spot_type: int, x: int, y: int):
+        index = len(self.x)
+        same_type = self.spots_by_type.setdefault(spot_type, array('l'))
+        self.type_ranks.append(len(same_type))
+        same_type.append(index)
+        self.x.append(x)
+        self.y.append(y)
+        self.type_codes.append(spot_type)
+        self.occupied.append(0)
+        self.timestamps.append(0.0)
+        self.vehicle_ids.append(self.NO_VEHICLE)
+        self.entrance_nos.append(0)
+        return index
+
+    def is_available(self, index: int):
+        return not self.occupied[index]
+
+    def assign(self, index: int, vehicle: Vehicle, timestamp: float, entrance_no: int = 0):
+        vehicle_id = next(self._vehicle_id_counter)
+        self._vehicles[vehicle_id] = (index, vehicle)
+        self.vehicle_ids[index] = vehicle_id
+        self.timestamps[index] = timestamp
+        self.entrance_nos[index] = entrance_no
+        self.occupied[index] = 1
+
+    def release(self, index: int):
+        vehicle_id = self.vehicle_ids[index]
+        self.vehicle_ids[index] = self.NO_VEHICLE
+        self.timestamps[index] = 0.0
+        self.entrance_nos[index] = 0
+        self.occupied[index] = 0
+        _, vehicle = self._vehicles.pop(vehicle_id, (index, None))
+        return vehicle
+
+    def get_vehicle(self, index: int):
+        _, vehicle = self._vehicles.get(self.vehicle_ids[index], (index, None))
+        return vehicle
+
+    def parked_vehicles(self):
+        """Yields (registration number, spot index) for every parked vehicle without scanning empty spots."""
+        for index, vehicle in list(self._vehicles.values()):
+            yield vehicle.get_registration_number(), index
@@ -0,0 +1,109 @@
+'''
+Runs gates that park and leave concurrently and checks that no spot is ever
+given to two vehicles at once.
+
+The first run shares one ParkingLot(thread_safe=True) between gate threads. It
+checks correctness only: the threads take turns on the interpreter, so its
+ops/s does not grow with gates. The second run gives every gate its own
+ProcessShard, the way a garage is split per level, and its ops/s grows with
+gates up to the number of cores.
+'''
+from parking_lot import ParkingLot
+from sharded_lot import ProcessShard
+import multiprocessing
+import random
+import threading
+import time
+
+TOTAL_SPOTS = 2000
+OPERATIONS_PER_GATE = 20000
+ENTRANCES = [(0, 0), (0, 45), (45, 0), (45, 45), (22, 0), (0, 22), (45, 22), (22, 45)]
+GATES = (1, 2, 4, 8)
+
+class DoubleAssignment(Exception):
+    pass
+
+def run_gate(park, leave, gate: int, capacity: int, held: dict, held_lock: threading.Lock, errors: list):
+    """Drives one gate. park returns a key identifying the spot it claimed and leave frees a vehicle."""
+    rng = random.Random(gate)
+    parked = []
+    try:
+        for counter in range(OPERATIONS_PER_GATE):
+            if parked and (len(parked) > capacity or rng.random() < 0.45):
+                reg_no, spot = parked.pop(rng.randrange(len(parked)))
+                # stop holding the spot before it can be handed to another gate
+                with held_lock:
+                    del held[spot]
+                leave(reg_no)
+            else:
+                reg_no = f"G{gate}-{counter}"
+                try:
+                    spot = park(reg_no, rng.choice(["red", "blue"]), rng.randint(1, 3), gate % len(ENTRANCES) + 1)
+                except ValueError:
+                    continue
+                with held_lock:
+                    if spot in held:
+                        raise DoubleAssignment(f"spot {spot} given to {reg_no} and {held[spot]}")
+                    held[spot] = reg_no
+                parked.append((reg_no, spot))
+    except Exception as error:
+        errors.append(error)
+
+def run_threads(gate_functions, capacity: int, held: dict):
+    held_lock, errors = threading.Lock(), []
+    threads = [threading.Thread(target=run_gate, args=(park, leave, gate, capacity, held, held_lock, errors))
+               for gate, (park, leave) in enumerate(gate_functions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return len(threads) * OPERATIONS_PER_GATE / elapsed
+
+def run_shared(gates: int):
+    parking_lot = ParkingLot(TOTAL_SPOTS, 5, entrances=ENTRANCES, thread_safe=True)
+
+    def park(reg_no, color, vehicle_type, entrance_no):
+        return parking_lot.assign_spot(reg_no, color, vehicle_type, entrance_no).get_index()
+
+    def leave(reg_no):
+        parking_lot.release_spot(reg_no)
+
+    held = {}
+    rate = run_threads([(park, leave)] * gates, TOTAL_SPOTS // (2 * len(ENTRANCES)), held)
+    occupied = sum(parking_lot.spot_table.occupied)
+    if occupied != len(parking_lot.assigned_spots) or occupied != len(held):
+        raise DoubleAssignment(f"{occupied} spots occupied but {len(parking_lot.assigned_spots)} tickets issued")
+    return rate
+
+def run_sharded(gates: int):
+    # the same garage split into one level per gate
+    shards = [ProcessShard(TOTAL_SPOTS // gates, 5, entrances=ENTRANCES) for _ in range(gates)]
+    try:
+        gate_functions = []
+        for gate, shard in enumerate(shards):
+            def park(reg_no, color, vehicle_type, entrance_no, gate=gate, shard=shard):
+                return (gate, *shard.park(reg_no, color, vehicle_type, entrance_no))
+            gate_functions.append((park, shard.leave))
+        held = {}
+        rate = run_threads(gate_functions, TOTAL_SPOTS // (2 * gates), held)
+        parked = sum(sum(free.values()) for free in (shard.free_capacity() for shard in shards))
+        if TOTAL_SPOTS // gates * gates - parked != len(held):
+            raise DoubleAssignment(f"shards report {TOTAL_SPOTS // gates * gates - parked} parked, gates hold {len(held)}")
+        return rate
+    finally:
+        for shard in shards:
+            shard.close()
+
+def main():
+    print(f"{multiprocessing.cpu_count()} cores")
+    print(f"{'gates':>6} {'shared lot ops/s':>17} {'shard per gate ops/s':>21}")
+    for gates in GATES:
+        print(f"{gates:>6} {run_shared(gates):>17.0f} {run_sharded(gates):>21.0f}")
+    print("no spot was double-assigned")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,9 @@ class Type:
     def get_type(self):
         return self.types[self._type]
     
+    def get_type_code(self):
+        return self._type
+
     def set_type(self, type_of: int):
         self._type = type_of
     
@@ -0,0 +1,52 @@
+'''
+Compares random self-play through Board.move, one game at a time, with the batch
+simulator in one process and across growing process pools, then shows how the
+strategies fare against each other.
+'''
+from board import Board
+from simulator import has_numpy, simulate
+import contextlib
+import io
+import multiprocessing
+import random
+import time
+
+GAMES = 200_000
+BASELINE_GAMES = 20_000
+
+def play_with_board(games: int):
+    rng = random.Random(0)
+    board = Board(3, 2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(games):
+            board.reset()
+            board.index = 0
+            cells = [(row, col) for row in range(3) for col in range(3)]
+            rng.shuffle(cells)
+            for row, col in cells:
+                board.move(row, col)
+                if board.winner is not None:
+                    break
+
+def main():
+    start = time.perf_counter()
+    play_with_board(BASELINE_GAMES)
+    print(f"Board.move, one game at a time: {BASELINE_GAMES / (time.perf_counter() - start):,.0f} games/s")
+
+    backends = [("BitBoard", False)] + ([("NumPy batches", True)] if has_numpy() else [])
+    for name, vectorized in backends:
+        games = GAMES if vectorized else GAMES // 10
+        for workers in sorted({1, 2, multiprocessing.cpu_count()}):
+            start = time.perf_counter()
+            stats = simulate(games, workers=workers, vectorized=vectorized)
+            elapsed = time.perf_counter() - start
+            print(f"{name}, {workers} worker(s): {games / elapsed:,.0f} games/s")
+    print(stats.summary())
+
+    for strategies in (("greedy", "random"), ("random", "greedy"), ("greedy", "greedy")):
+        stats = simulate(GAMES // 4, strategies=strategies, record=True)
+        print(f"\n{strategies[0]} against {strategies[1]}")
+        print(stats.summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+from typing import List
+
+class BitBoard:
+    """A drop-in replacement for Board that keeps one integer bitboard per player.
+
+    Cell (row, col) is bit row * (n + 1) + col. The spare column at the end of every
+    row is always empty, so shifting a bitboard never carries a line from one row
+    into the next. A move is checked for k in a row along the four directions with
+    a few shift-and-mask operations, whatever the number of players, and can be
+    undone.
+    """
+
+    __slots__ = ('n', 'win_length', 'total_players', 'winner', 'index', 'total_moves',
+                 '_width', '_bitboards', '_occupied', '_moves', '_shifts')
+
+    def __init__(self, n, players, win_length=None):
+        self.n = n
+        self.win_length = n if win_length is None else win_length
+        if not 1 <= self.win_length <= n:
+            raise ValueError(f"Win length must be between 1 and {n}")
+        self.total_players = players
+        self._width = n + 1
+        # horizontal, vertical, diagonal and anti-diagonal neighbours
+        self._shifts = (1, self._width, self._width + 1, self._width - 1)
+        self.reset()
+
+    def reset(self):
+        self._bitboards: List[int] = [0] * self.total_players
+        self._occupied = 0
+        self._moves: List[int] = []
+        self.winner = None
+        self.index = 0
+        self.total_moves = 0
+
+    def _has_line(self, bitboard: int):
+        length = self.win_length
+        for shift in self._shifts:
+            # after each step a set bit marks the start of a run of `run` stones
+            run, runs = 1, bitboard
+            while run < length and runs:
+                step = min(run, length - run)
+                runs &= runs >> (shift * step)
+                run += step
+            if runs:
+                return True
+        return False
+
+    def validate(self, row, col):
+        """Returns why the current player cannot play (row, col), or None if they can."""
+        if self.index < 0 or self.index >= self.total_players:
+            return "Player does not exist"
+        if row >= self.n or col >= self.n or row < 0 or col < 0:
+            return "Incorrect Input"
+        if self.winner is not None:
+            return f"Player {self.winner} already won the game"
+        if self._occupied >> (row * self._width + col) & 1:
+            return "That position is already occupied. Try again"
+        return None
+
+    def move(self, row, col):
+        error = self.validate(row, col)
+        if error:
+            print(error)
+            return
+        index = self.index
+        if self.play(row, col):
+            print(f"Player {index} wins")
+        elif self.winner == "Draw":
+            print("Game is a draw")
+
+    def play(self, row, col):
+        """Places the current player's stone without any checks or output. Returns True if it wins."""
+        index = self.index
+        bit = 1 << (row * self._width + col)
+        self._bitboards[index] |= bit
+        self._occupied |= bit
+        self._moves.append(bit)
+        self.total_moves += 1
+        self.index = (index + 1) % self.total_players
+
+        if self._has_line(self._bitboards[index]):
+            self.winner = index
+            return True
+        if self.total_moves == self.n * self.n:
+            self.winner = "Draw"
+        return False
+
+    def undo(self):
+        """Takes back the last move."""
+        if not self._moves:
+            raise ValueError("There are no moves to undo")
+        bit = self._moves.pop()
+        self.index = (self.index - 1) % self.total_players
+        self._bitboards[self.index] &= ~bit
+        self._occupied &= ~bit
+        self.total_moves -= 1
+        self.winner = None
+
+    def is_empty(self, row, col):
+        return not self._occupied >> (row * self._width + col) & 1
+
+    def get(self, row, col):
+        """Returns the player on a cell, or ' ' when it is empty."""
+        bit = 1 << (row * self._width + col)
+        for player, bitboard in enumerate(self._bitboards):
+            if bitboard & bit:
+                return player
+        return ' '
+
+    @property
+    def board(self):
+        return [[self.get(row, col) for col in range(self.n)] for row in range(self.n)]
+
+    def printBoard(self):
+        board = self.board
+        print("    ", end="")
+        for col in range(self.n):
+            print(f"{col}   ", end="")
+        print()
+
+        for i in range(self.n):
+            print("   " + "+---" * self.n + "+")
+            print(f"{i}  |", end="")
+            for j in range(self.n):
+                print(f" {board[i][j]} |", end="")
+            print()
+        print("   " + "+---" * self.n + "+")
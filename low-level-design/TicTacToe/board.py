@@ -7,6 +7,8 @@ class Board:
         self.players: List[Player] = []
         self.board = [[' ' for _ in range(n)] for _ in range(n)]
         self.n = n
+        # a player has to fill a whole row, column or diagonal
+        self.win_length = n
         self.winner = None
         self.index = 0
         self.total_moves = 0
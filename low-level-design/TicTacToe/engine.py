@@ -0,0 +1,265 @@
+from board import Board
+from collections import namedtuple
+from typing import List
+import random
+import time
+
+SearchResult = namedtuple('SearchResult', ['move', 'score', 'depth', 'nodes', 'nodes_per_second', 'hit_rate'])
+
+EMPTY = -1
+WIN = 1 << 40
+EXACT, LOWER, UPPER = 0, 1, 2
+
+class TimeUp(Exception):
+    pass
+
+class TranspositionTable:
+    """A fixed-size hash table of search results indexed by Zobrist key.
+
+    An entry is replaced when its slot is empty, when it was stored by an earlier
+    search, or when the new result was searched at least as deep.
+    """
+
+    def __init__(self, size: int = 1 << 18):
+        self.size = size
+        self._mask = size - 1
+        if size & self._mask:
+            raise ValueError("Table size should be a power of two")
+        self._entries = [None] * size
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+
+    def new_search(self):
+        self.generation += 1
+        self.probes = 0
+        self.hits = 0
+
+    def get(self, key: int):
+        self.probes += 1
+        entry = self._entries[key & self._mask]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def put(self, key: int, depth: int, value, flag: int, move: int):
+        slot = key & self._mask
+        entry = self._entries[slot]
+        if entry is None or entry[5] != self.generation or depth >= entry[1]:
+            self._entries[slot] = (key, depth, value, flag, move, self.generation)
+
+class SearchEngine:
+    """A computer opponent for n x n boards with any number of players.
+
+    Two players are searched with negamax and alpha-beta pruning, more with max^n.
+    Both use iterative deepening under a time budget, Zobrist hashing into a
+    bounded transposition table and move ordering by the table's best move,
+    a history heuristic and closeness to the centre.
+    """
+
+    def __init__(self, time_budget: float = 1.0, table_size: int = 1 << 18, seed: int = 2024):
+        self.time_budget = time_budget
+        self.table = TranspositionTable(table_size)
+        self._random = random.Random(seed)
+        self._geometry = None
+
+    def _prepare(self, n: int, win_length: int, players: int):
+        if self._geometry == (n, win_length, players):
+            return
+        self._geometry = (n, win_length, players)
+        self.n, self.win_length, self.players = n, win_length, players
+        cells = n * n
+        self._zobrist = [[self._random.getrandbits(64) for _ in range(players)] for _ in range(cells)]
+        self._turn_keys = [self._random.getrandbits(64) for _ in range(players)]
+
+        # every window of win_length cells in a row, column or diagonal, and the windows through each cell
+        self._lines: List[List[int]] = []
+        for row in range(n):
+            for col in range(n):
+                for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_row, end_col = row + d_row * (win_length - 1), col + d_col * (win_length - 1)
+                    if 0 <= end_row < n and 0 <= end_col < n:
+                        self._lines.append([(row + d_row * step) * n + col + d_col * step for step in range(win_length)])
+        self._lines_through = [[] for _ in range(cells)]
+        for line in self._lines:
+            for cell in line:
+                self._lines_through[cell].append(line)
+
+        centre = (n - 1) / 2
+        self._centrality = [-(abs(cell // n - centre) + abs(cell % n - centre)) for cell in range(cells)]
+        self.table = TranspositionTable(self.table.size)
+
+    def best_move(self, board: Board):
+        """Returns (row, col) for the player to move on board."""
+        return self.search(board).move
+
+    def search(self, board: Board) -> SearchResult:
+        self._prepare(board.n, board.win_length, board.total_players)
+        n = board.n
+        self._cells = [EMPTY if board.board[cell // n][cell % n] == ' ' else board.board[cell // n][cell % n]
+                       for cell in range(n * n)]
+        self._empty = sum(1 for value in self._cells if value == EMPTY)
+        self._key = self._turn_keys[board.index]
+        for cell, value in enumerate(self._cells):
+            if value != EMPTY:
+                self._key ^= self._zobrist[cell][value]
+        self._history = [0] * (n * n)
+        self.table.new_search()
+        self.nodes = 0
+        start = time.perf_counter()
+        self._deadline = start + self.time_budget
+
+        moves = self._ordered_moves(None)
+        best = SearchResult((moves[0] // n, moves[0] % n), 0, 0, 0, 0.0, 0.0)
+        for depth in range(1, self._empty + 1):
+            try:
+                if self.players == 2:
+                    score, move = self._negamax_root(depth, board.index)
+                else:
+                    scores, move = self._maxn(depth, board.index, 0)
+                    score = scores[board.index]
+            except TimeUp:
+                break
+            elapsed = max(time.perf_counter() - start, 1e-9)
+            best = SearchResult((move // n, move % n), score, depth, self.nodes, self.nodes / elapsed,
+                                self.table.hits / max(self.table.probes, 1))
+            if abs(score) >= WIN - n * n:
+                break
+        return best
+
+    def _ordered_moves(self, first):
+        moves = [cell for cell, value in enumerate(self._cells) if value == EMPTY]
+        moves.sort(key=lambda cell: (cell != first, -self._history[cell], -self._centrality[cell]))
+        return moves
+
+    def _play(self, cell: int, player: int):
+        self._cells[cell] = player
+        self._empty -= 1
+        self._key ^= self._zobrist[cell][player] ^ self._turn_keys[player] ^ self._turn_keys[(player + 1) % self.players]
+
+    def _undo(self, cell: int, player: int):
+        self._cells[cell] = EMPTY
+        self._empty += 1
+        self._key ^= self._zobrist[cell][player] ^ self._turn_keys[player] ^ self._turn_keys[(player + 1) % self.players]
+
+    def _wins(self, cell: int, player: int):
+        cells = self._cells
+        return any(all(cells[other] == player for other in line) for line in self._lines_through[cell])
+
+    def _tick(self):
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and time.perf_counter() > self._deadline:
+            raise TimeUp()
+
+    def _potentials(self):
+        """Scores every player by the windows only they occupy, weighted by how full those windows are."""
+        scores = [0] * self.players
+        cells = self._cells
+        for line in self._lines:
+            owner, count = EMPTY, 0
+            for cell in line:
+                value = cells[cell]
+                if value == EMPTY:
+                    continue
+                if owner == EMPTY:
+                    owner = value
+                elif owner != value:
+                    owner = None
+                    break
+                count += 1
+            if owner is not None and owner != EMPTY:
+                scores[owner] += 1 << (2 * count)
+        return scores
+
+    def _negamax_root(self, depth: int, player: int):
+        entry = self.table.get(self._key)
+        best_score, best_move = -WIN - 1, None
+        alpha, beta = -WIN - 1, WIN + 1
+        for cell in self._ordered_moves(entry[4] if entry else None):
+            score = self._negamax_after(cell, player, depth, -beta, -alpha, 1)
+            if score > best_score:
+                best_score, best_move = score, cell
+            alpha = max(alpha, score)
+        self.table.put(self._key, depth, best_score, EXACT, best_move)
+        return best_score, best_move
+
+    def _negamax_after(self, cell: int, player: int, depth: int, alpha: int, beta: int, ply: int):
+        """Plays cell for player and returns its value from player's point of view."""
+        self._play(cell, player)
+        try:
+            if self._wins(cell, player):
+                return WIN - ply
+            if self._empty == 0:
+                return 0
+            return -self._negamax(depth - 1, 1 - player, alpha, beta, ply + 1)
+        finally:
+            self._undo(cell, player)
+
+    def _negamax(self, depth: int, player: int, alpha: int, beta: int, ply: int):
+        self._tick()
+        if depth == 0:
+            scores = self._potentials()
+            return scores[player] - scores[1 - player]
+
+        original_alpha = alpha
+        entry = self.table.get(self._key)
+        if entry is not None and entry[1] >= depth:
+            _, _, value, flag, _, _ = entry
+            if flag == EXACT:
+                return value
+            if flag == LOWER:
+                alpha = max(alpha, value)
+            elif flag == UPPER:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return value
+
+        best_score, best_move = -WIN - 1, None
+        for cell in self._ordered_moves(entry[4] if entry else None):
+            score = self._negamax_after(cell, player, depth, -beta, -alpha, ply)
+            if score > best_score:
+                best_score, best_move = score, cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self._history[cell] += depth * depth
+                break
+
+        flag = UPPER if best_score <= original_alpha else LOWER if best_score >= beta else EXACT
+        self.table.put(self._key, depth, best_score, flag, best_move)
+        return best_score
+
+    def _maxn(self, depth: int, player: int, ply: int):
+        """Returns (score vector, best move) where every player maximises their own entry."""
+        self._tick()
+        if depth == 0:
+            scores = self._potentials()
+            total = sum(scores)
+            return [score * self.players - total for score in scores], None
+
+        entry = self.table.get(self._key)
+        if entry is not None and entry[1] >= depth:
+            return entry[2], entry[4]
+
+        best_scores, best_move = None, None
+        next_player = (player + 1) % self.players
+        for cell in self._ordered_moves(entry[4] if entry else None):
+            self._play(cell, player)
+            try:
+                if self._wins(cell, player):
+                    scores = [-(WIN - ply)] * self.players
+                    scores[player] = WIN - ply
+                elif self._empty == 0:
+                    scores = [0] * self.players
+                else:
+                    scores, _ = self._maxn(depth - 1, next_player, ply + 1)
+            finally:
+                self._undo(cell, player)
+            if best_scores is None or scores[player] > best_scores[player]:
+                best_scores, best_move = scores, cell
+                if scores[player] >= WIN - ply - 1:
+                    self._history[cell] += depth * depth
+                    break
+
+        self.table.put(self._key, depth, best_scores, EXACT, best_move)
+        return best_scores, best_move
@@ -0,0 +1,82 @@
+'''
+Plays many concurrent games against a running game_server.py and reports how
+many games the server held at once and move latency percentiles.
+
+    python game_server.py &
+    python game_load_test.py --connections 100 --games 50 --size 5
+'''
+import argparse
+import asyncio
+import random
+import time
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+async def run_connection(connection: int, args, latencies: list, held: list, errors: list):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix, limit=1 << 24)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=1 << 24)
+    rng = random.Random(connection)
+
+    async def request(lines):
+        writer.write(("\n".join(lines) + "\n").encode())
+        return [(await reader.readline()).decode().split() for _ in lines]
+
+    responses = await request([f"N {args.size} {args.players}"] * args.games)
+    # game id -> [next player, empty cells]
+    games = {int(response[1]): [0, list(range(args.size * args.size))] for response in responses}
+    held.append(int((await request(["I"]))[0][1]))
+
+    while games:
+        batch, moved = [], []
+        for game_id, state in games.items():
+            cell = state[1].pop(rng.randrange(len(state[1])))
+            batch.append(f"M {game_id} {state[0]} {cell // args.size} {cell % args.size}")
+            moved.append(game_id)
+        sent = time.perf_counter()
+        responses = await request(batch)
+        latencies.extend([time.perf_counter() - sent] * len(batch))
+        for game_id, response in zip(moved, responses):
+            if response[0] != "OK":
+                errors.append(" ".join(response))
+                del games[game_id]
+            elif response[1] == "next":
+                games[game_id][0] = int(response[2])
+            else:
+                del games[game_id]
+        finished = [f"Q {game_id}" for game_id in moved if game_id not in games]
+        if finished:
+            await request(finished)
+    writer.close()
+    await writer.wait_closed()
+
+async def run(args):
+    latencies, held, errors = [], [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(connection, args, latencies, held, errors)
+                           for connection in range(args.connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{args.connections * args.games} games, {len(latencies)} moves in {elapsed:.2f}s: "
+          f"{len(latencies) / elapsed:.0f} moves/s")
+    print(f"up to {max(held)} games held at once")
+    print(f"move latency p50 {percentile(latencies, 0.5) * 1e3:.2f}ms, p99 {percentile(latencies, 0.99) * 1e3:.2f}ms, "
+          f"max {latencies[-1] * 1e3:.2f}ms")
+    print(f"{len(errors)} rejected moves")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7071)
+    parser.add_argument("--unix", help="connect to a unix socket at this path instead of tcp")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--games", type=int, default=50, help="games each connection plays at once")
+    parser.add_argument("--size", type=int, default=5)
+    parser.add_argument("--players", type=int, default=2)
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
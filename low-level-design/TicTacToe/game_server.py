@@ -0,0 +1,171 @@
+'''
+An asyncio server that hosts many TicTacToe games in one process over a local socket.
+
+Requests and responses are single lines:
+
+    N <n> <players> [win length]      ->  OK <game id>
+    M <game id> <player> <row> <col>  ->  OK next <player> | OK win <player> | OK draw
+    S <game id>                       ->  OK <next player> <cells, row by row, '.' when empty>
+    Q <game id>                       ->  OK
+    I                                 ->  OK <live games> <evicted games>
+    anything that fails               ->  ERR <reason>
+
+Every game is a BitBoard. Games nobody has touched for the idle timeout are
+evicted. Clients may pipeline requests; every request that has arrived by the
+time the connection is read is answered with a single write.
+'''
+from bitboard import BitBoard
+from collections import OrderedDict
+from typing import Dict
+import argparse
+import asyncio
+import itertools
+import time
+
+MAX_SIZE = 15
+MAX_PLAYERS = 8
+
+class GameRegistry:
+    """The live games, ordered from the least to the most recently used."""
+
+    def __init__(self, idle_timeout: float = 300.0):
+        self.idle_timeout = idle_timeout
+        self.games: Dict[int, BitBoard] = {}
+        self._last_used: "OrderedDict[int, float]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.games)
+
+    def create(self, n: int, players: int, win_length: int = None):
+        if not 1 <= n <= MAX_SIZE or not 2 <= players <= MAX_PLAYERS:
+            raise ValueError(f"Boards are 1 to {MAX_SIZE} wide with 2 to {MAX_PLAYERS} players")
+        if win_length is not None and not 1 <= win_length <= n:
+            raise ValueError(f"Win length must be between 1 and {n}")
+        board = BitBoard(n, players, win_length)
+        game_id = next(self._ids)
+        self.games[game_id] = board
+        self._last_used[game_id] = time.monotonic()
+        return game_id
+
+    def get(self, game_id: int):
+        board = self.games.get(game_id)
+        if board is None:
+            raise ValueError(f"Game {game_id} does not exist")
+        self._last_used[game_id] = time.monotonic()
+        self._last_used.move_to_end(game_id)
+        return board
+
+    def remove(self, game_id: int):
+        if self.games.pop(game_id, None) is None:
+            raise ValueError(f"Game {game_id} does not exist")
+        del self._last_used[game_id]
+
+    def evict_idle(self, now: float = None):
+        """Drops every game idle for longer than the timeout. Returns how many were dropped."""
+        deadline = (now or time.monotonic()) - self.idle_timeout
+        evicted = 0
+        while self._last_used:
+            game_id, last_used = next(iter(self._last_used.items()))
+            if last_used > deadline:
+                break
+            self._last_used.popitem(last=False)
+            del self.games[game_id]
+            evicted += 1
+        self.evicted += evicted
+        return evicted
+
+class GameServer:
+
+    def __init__(self, registry: GameRegistry):
+        self.registry = registry
+
+    def handle_line(self, line: str):
+        fields = line.split()
+        if not fields:
+            return "ERR empty request"
+        command = fields[0]
+        try:
+            if command == "M" and len(fields) == 5:
+                game_id, player, row, col = map(int, fields[1:])
+                board = self.registry.get(game_id)
+                if player != board.index and board.winner is None:
+                    return f"ERR It is player {board.index}'s turn"
+                error = board.validate(row, col)
+                if error:
+                    return f"ERR {error}"
+                if board.play(row, col):
+                    return f"OK win {player}"
+                if board.winner == "Draw":
+                    return "OK draw"
+                return f"OK next {board.index}"
+            if command == "N" and len(fields) in (3, 4):
+                return f"OK {self.registry.create(*map(int, fields[1:]))}"
+            if command == "S" and len(fields) == 2:
+                board = self.registry.get(int(fields[1]))
+                cells = "".join("." if cell == " " else str(cell) for row in board.board for cell in row)
+                return f"OK {board.index} {cells}"
+            if command == "Q" and len(fields) == 2:
+                self.registry.remove(int(fields[1]))
+                return "OK"
+            if command == "I" and len(fields) == 1:
+                return f"OK {len(self.registry)} {self.registry.evicted}"
+        except ValueError as error:
+            return f"ERR {error}"
+        return f"ERR Cannot parse request {line.strip()!r}"
+
+    def handle_request(self, line: bytes):
+        try:
+            text = line.decode()
+        except UnicodeDecodeError:
+            return "ERR Requests must be UTF-8"
+        return self.handle_line(text)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        pending = b""
+        try:
+            while True:
+                chunk = await reader.read(1 << 16)
+                if not chunk:
+                    break
+                *lines, pending = (pending + chunk).split(b"\n")
+                if not lines:
+                    continue
+                responses = [self.handle_request(line) for line in lines]
+                writer.write(("\n".join(responses) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def evict_forever(self):
+        while True:
+            await asyncio.sleep(max(self.registry.idle_timeout / 4, 0.05))
+            self.registry.evict_idle()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 7071, unix_path: str = None):
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_path, backlog=1024)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host=host, port=port, backlog=1024)
+        evictor = asyncio.create_task(self.evict_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7071)
+    parser.add_argument("--unix", help="listen on a unix socket at this path instead of tcp")
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an untouched game is evicted")
+    args = parser.parse_args()
+
+    asyncio.run(GameServer(GameRegistry(args.idle_timeout)).serve(args.host, args.port, args.unix))
+
+if __name__ == "__main__":
+    main()
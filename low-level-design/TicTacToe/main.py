@@ -1,14 +1,24 @@
 from board import Board
+from engine import SearchEngine
 
 board = Board(4, 2)
+# players controlled by the computer, leave empty for human against human
+computer_players = {1}
+engine = SearchEngine(time_budget=1.0)
 
 while board.winner == None:
     try:
         board.printBoard()
+        if board.index in computer_players:
+            result = engine.search(board)
+            print(f"Computer plays {result.move[0]} {result.move[1]} (depth {result.depth}, "
+                  f"{result.nodes_per_second:.0f} nodes/s, {result.hit_rate:.0%} table hits)")
+            board.move(*result.move)
+            continue
         row, col = input("Where would you like to place ").split(" ")
         row = int(row)
         col = int(col)
         board.move(row, col)
         board.printBoard()
     except Exception as e:
-        print("Incorrect input. Try again")
\ No newline at end of file
+        print("Incorrect input. Try again")
@@ -0,0 +1,228 @@
+"""This module plays many headless TicTacToe games at once for strategy evaluation.
+
+Games are simulated in batches. With NumPy every batch is a (games x cells) array
+advanced one ply at a time for all unfinished games together; without it each
+game of the batch is played on a BitBoard. Batches are spread over a process pool
+and their statistics merged.
+
+Strategies choose a move from the empty cells:
+    random  any empty cell
+    centre  a random cell, weighted towards the centre
+    greedy  a winning cell if there is one, else a cell that blocks the next
+            player's win, else as centre
+"""
+from bitboard import BitBoard
+from typing import List, Sequence
+import multiprocessing
+import random
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+STRATEGIES = ("random", "centre", "greedy")
+# a game record is the cells in the order they were played, one byte each
+MAX_CELLS = 255
+
+def has_numpy():
+    return np is not None
+
+class SimulationStats:
+    """Outcome counts of a set of games, and their records when they were kept."""
+
+    def __init__(self, n: int, players: int):
+        self.n = n
+        self.players = players
+        self.games = 0
+        self.wins = [0] * players
+        self.draws = 0
+        self.total_moves = 0
+        # lengths[moves] is the number of games that ended after that many moves
+        self.lengths = [0] * (n * n + 1)
+        self.records: List[bytes] = []
+
+    def add_game(self, winner, moves: int):
+        self.games += 1
+        if winner is None:
+            self.draws += 1
+        else:
+            self.wins[winner] += 1
+        self.total_moves += moves
+        self.lengths[moves] += 1
+
+    def merge(self, other: "SimulationStats"):
+        self.games += other.games
+        self.wins = [mine + theirs for mine, theirs in zip(self.wins, other.wins)]
+        self.draws += other.draws
+        self.total_moves += other.total_moves
+        self.lengths = [mine + theirs for mine, theirs in zip(self.lengths, other.lengths)]
+        self.records.extend(other.records)
+
+    def summary(self):
+        games = max(self.games, 1)
+        lines = [f"{self.games} games, average length {self.total_moves / games:.2f} moves"]
+        for player, wins in enumerate(self.wins):
+            lines.append(f"Player {player} wins {wins} ({wins / games:.1%})")
+        lines.append(f"Draws {self.draws} ({self.draws / games:.1%})")
+        return "\n".join(lines)
+
+def write_records(records: Sequence[bytes], path: str):
+    """Writes game records as a length byte followed by the cells played."""
+    with open(path, "wb") as output:
+        for record in records:
+            output.write(bytes((len(record),)) + record)
+
+def read_records(path: str):
+    with open(path, "rb") as records:
+        data = records.read()
+    position = 0
+    while position < len(data):
+        length = data[position]
+        yield data[position + 1:position + 1 + length]
+        position += 1 + length
+
+def _lines(n: int, win_length: int):
+    """Every window of win_length cells in a row, column or diagonal."""
+    lines = []
+    for row in range(n):
+        for col in range(n):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + d_row * (win_length - 1), col + d_col * (win_length - 1)
+                if 0 <= end_row < n and 0 <= end_col < n:
+                    lines.append([(row + d_row * step) * n + col + d_col * step for step in range(win_length)])
+    return lines
+
+def _centre_weights(n: int):
+    centre = (n - 1) / 2
+    return [1.0 / (1.0 + abs(cell // n - centre) + abs(cell % n - centre)) for cell in range(n * n)]
+
+def _play_batch_numpy(n, players, win_length, strategies, games, seed, record):
+    rng = np.random.default_rng(seed)
+    cells = n * n
+    lines = np.asarray(_lines(n, win_length), dtype=np.intp)
+    # incidence[line, cell] is 1 when the cell lies on the line
+    incidence = np.zeros((len(lines), cells), dtype=np.int32)
+    incidence[np.arange(len(lines))[:, None], lines] = 1
+    weights = np.asarray(_centre_weights(n))
+
+    board = np.full((games, cells), -1, dtype=np.int8)
+    winners = np.full(games, -1, dtype=np.int64)
+    lengths = np.full(games, cells, dtype=np.int64)
+    moves = np.full((games, cells), MAX_CELLS, dtype=np.uint8) if record else None
+    active = np.arange(games)
+
+    for ply in range(cells):
+        if active.size == 0:
+            break
+        player = ply % players
+        current = board[active]
+        empty = current == -1
+        strategy = strategies[player]
+        # dividing the weights by exponential noise picks each cell with probability proportional to its weight
+        scores = (weights if strategy != "random" else 1.0) / rng.exponential(size=current.shape)
+        if strategy == "greedy":
+            windows = current[:, lines]
+            open_cells = (windows == -1).sum(axis=2) == 1
+            # blocking the next player beats any weight and winning beats blocking
+            for owner, value in (((player + 1) % players, 1e300), (player, np.inf)):
+                threats = open_cells & ((windows == owner).sum(axis=2) == win_length - 1)
+                scores[(threats.astype(np.int32) @ incidence) > 0] = value
+        scores[~empty] = -1.0
+        chosen = scores.argmax(axis=1)
+        current[np.arange(active.size), chosen] = player
+        board[active] = current
+        if record:
+            moves[active, ply] = chosen
+
+        won = (current[:, lines] == player).all(axis=2).any(axis=1)
+        finished = active[won]
+        winners[finished] = player
+        lengths[finished] = ply + 1
+        active = active[~won]
+
+    stats = SimulationStats(n, players)
+    stats.games = games
+    stats.wins = np.bincount(winners[winners >= 0], minlength=players).tolist()
+    stats.draws = int((winners < 0).sum())
+    stats.total_moves = int(lengths.sum())
+    stats.lengths = np.bincount(lengths, minlength=cells + 1).tolist()
+    if record:
+        stats.records = [row[:length].tobytes() for row, length in zip(moves, lengths)]
+    return stats
+
+def _choose(board: BitBoard, strategy: str, empty: List[int], weights: List[float], rng: random.Random):
+    n = board.n
+    if strategy == "random":
+        return rng.choice(empty)
+    if strategy == "greedy":
+        player = board.index
+        for owner in (player, (player + 1) % board.total_players):
+            # try each cell for the owner by playing it out of turn and taking it back
+            board.index = owner
+            for cell in empty:
+                won = board.play(cell // n, cell % n)
+                board.undo()
+                if won:
+                    board.index = player
+                    return cell
+        board.index = player
+    return rng.choices(empty, weights=[weights[cell] for cell in empty])[0]
+
+def _play_batch_python(n, players, win_length, strategies, games, seed, record):
+    rng = random.Random(seed)
+    weights = _centre_weights(n)
+    board = BitBoard(n, players, win_length)
+    stats = SimulationStats(n, players)
+    for _ in range(games):
+        board.reset()
+        empty = list(range(n * n))
+        played = bytearray()
+        while board.winner is None:
+            cell = _choose(board, strategies[board.index], empty, weights, rng)
+            empty.remove(cell)
+            played.append(cell)
+            board.play(cell // n, cell % n)
+        stats.add_game(None if board.winner == "Draw" else board.winner, board.total_moves)
+        if record:
+            stats.records.append(bytes(played))
+    return stats
+
+def _play_batch(task):
+    n, players, win_length, strategies, games, seed, record, vectorized = task
+    if vectorized and np is not None:
+        return _play_batch_numpy(n, players, win_length, strategies, games, seed, record)
+    return _play_batch_python(n, players, win_length, strategies, games, seed, record)
+
+def simulate(games: int, n: int = 3, players: int = 2, win_length: int = None, strategies: Sequence[str] = None,
+             batch_size: int = 8192, workers: int = None, seed: int = 0, record: bool = False,
+             vectorized: bool = True) -> SimulationStats:
+    """Plays games and returns their merged statistics.
+
+    strategies names one strategy per player and defaults to random for everyone.
+    workers is the size of the process pool, the number of cores by default; with
+    one worker the batches run in this process.
+    """
+    win_length = win_length or n
+    strategies = tuple(strategies or ["random"] * players)
+    if len(strategies) != players or any(strategy not in STRATEGIES for strategy in strategies):
+        raise ValueError(f"Give one strategy per player from {STRATEGIES}")
+    if n * n > MAX_CELLS:
+        raise ValueError(f"Boards can have at most {MAX_CELLS} cells")
+    workers = workers or multiprocessing.cpu_count()
+
+    tasks = []
+    for batch, start in enumerate(range(0, games, batch_size)):
+        tasks.append((n, players, win_length, strategies, min(batch_size, games - start), seed * 1_000_003 + batch,
+                      record, vectorized))
+
+    stats = SimulationStats(n, players)
+    if workers == 1:
+        for task in tasks:
+            stats.merge(_play_batch(task))
+        return stats
+    with multiprocessing.Pool(workers) as pool:
+        # ordered so the records come out the same for any number of workers
+        for batch_stats in pool.imap(_play_batch, tasks):
+            stats.merge(batch_stats)
+    return stats
@@ -1,6 +1,8 @@
 from States.idle import Idle
 
 class CashInserted(Idle):
+    state_id = 1
+
     def __init__(self, state='cash inserted'):
         super().__init__(state)
     
@@ -8,4 +10,6 @@ class CashInserted(Idle):
         vending_machine.update_product(code)
     
     def refund(self, vending_machine):
-        vending_machine.refund_customer()
\ No newline at end of file
+        vending_machine.refund_customer()
+
+CASH_INSERTED_STATE = CashInserted()
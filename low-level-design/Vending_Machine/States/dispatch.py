@@ -0,0 +1,31 @@
+"""The shared state instances and the table of what every action does in every state.
+
+An action that a state does not override from State has no handler, so the
+machine can reject it without calling into the state and raising.
+"""
+from States.state import State
+from States.idle import IDLE_STATE
+from States.cash_inserted import CASH_INSERTED_STATE
+from States.dispense import DISPENSE_STATE
+
+OK, INVALID_ACTION = 0, 1
+
+INSERT_CASH, SELECT_PRODUCT, DISPENSE_PRODUCT, REQUEST_REFUND = 0, 1, 2, 3
+# the State method behind every action, in action order
+ACTION_METHODS = ("insert_cash", "select_product", "dispense_product", "refund")
+
+STATES = (IDLE_STATE, CASH_INSERTED_STATE, DISPENSE_STATE)
+
+def _build_table():
+    table = []
+    for state_id, state in enumerate(STATES):
+        assert state.state_id == state_id
+        row = []
+        for name in ACTION_METHODS:
+            handler = getattr(type(state), name)
+            row.append(None if handler is getattr(State, name) else handler)
+        table.append(tuple(row))
+    return tuple(table)
+
+# DISPATCH[state_id][action] is the state's handler for the action, or None if the action is invalid
+DISPATCH = _build_table()
@@ -1,10 +1,12 @@
 from States.state import State
 
 class Dispense(State):
-    
+    state_id = 2
+
     def __init__(self, state='dispense'):
         super().__init__(state)
 
     def dispense_product(self, vending_machine):
         vending_machine.dispense_to_customer()
-    
\ No newline at end of file
+
+DISPENSE_STATE = Dispense()
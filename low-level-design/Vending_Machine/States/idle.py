@@ -1,8 +1,12 @@
 from States.state import State
 
 class Idle(State):
+    state_id = 0
+
     def __init__(self, state='idle'):
         super().__init__(state)
     
     def insert_cash(self, vending_machine, amount: int):
-        vending_machine.update_amount(amount)
\ No newline at end of file
+        vending_machine.update_amount(amount)
+
+IDLE_STATE = Idle()
@@ -1,6 +1,9 @@
 from abc import ABC
 
 class State(ABC):
+    # row of the state in the dispatch table
+    state_id = None
+
     def __init__(self, state):
         self.state = state
     
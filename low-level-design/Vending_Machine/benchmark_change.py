@@ -0,0 +1,72 @@
+'''
+Sells items priced in cents through a VendingMachine that pays change from coin
+tubes, with and without the change cache, and checks both pay out the same coins.
+'''
+from change_maker import ChangeMaker, CoinTubes
+from inventory import Inventory
+from item import Item
+from vending_machine import VendingMachine
+import contextlib
+import os
+import random
+import time
+
+SALES = 100_000
+# prices in cents and how often each is chosen
+PRICES = [(100, 2), (125, 3), (150, 4), (175, 4), (200, 3), (225, 2), (250, 2), (300, 1), (350, 1)]
+TUBES = {100: 40, 25: 100, 10: 80, 5: 80}
+# the crew tops the tubes back up after this many sales
+SERVICE_INTERVAL = 200
+
+def payment(rng: random.Random, price: int):
+    """Returns the money a customer inserts for a price."""
+    style = rng.random()
+    if style < 0.35:
+        return [500]
+    if style < 0.65:
+        return [100] * -(-price // 100)
+    inserted = [100] * (price // 100)
+    while sum(inserted) < price:
+        inserted.append(rng.choice([25, 25, 25, 10, 5]))
+    return inserted
+
+def run(cache_size: int):
+    rng = random.Random(7)
+    prices = [price for price, _ in PRICES]
+    weights = [weight for _, weight in PRICES]
+    items = [Item(f"Item {price}", price // 2, price, code, SALES) for code, price in enumerate(prices, 1)]
+    vending_machine = VendingMachine(Inventory(items))
+    tubes = CoinTubes(TUBES)
+    vending_machine.change_maker = ChangeMaker(tubes, cache_size=cache_size)
+    payouts, refused = [], 0
+
+    start = time.perf_counter()
+    for sale in range(SALES):
+        code = rng.choices(range(1, len(prices) + 1), weights)[0]
+        for money in payment(rng, prices[code - 1]):
+            vending_machine.insert_cash(money)
+        vending_machine.select_product(code)
+        before = dict(tubes.counts)
+        vending_machine.dispense_product()
+        if tubes.counts == before:
+            refused += 1
+        payouts.append(tuple(sorted(tubes.counts.items())))
+        if sale % SERVICE_INTERVAL == SERVICE_INTERVAL - 1:
+            for denomination, count in TUBES.items():
+                tubes.refill(denomination, max(0, count - tubes.counts[denomination]))
+    elapsed = time.perf_counter() - start
+    return elapsed, payouts, refused, vending_machine.change_maker
+
+def main():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        uncached_time, uncached_payouts, _, _ = run(cache_size=0)
+        cached_time, cached_payouts, refused, change_maker = run(cache_size=4096)
+    assert cached_payouts == uncached_payouts, "the cache changed a payout"
+    print(f"without the cache: {SALES / uncached_time:,.0f} sales/s")
+    print(f"with the cache:    {SALES / cached_time:,.0f} sales/s ({uncached_time / cached_time:.2f}x), "
+          f"{change_maker.hits / (change_maker.hits + change_maker.misses):.1%} hits, "
+          f"{change_maker.misses} plans computed")
+    print(f"{refused} sales refused for lack of change, both runs paid the same coins")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+'''
+Measures transaction ingest into a TransactionLog one event at a time, in
+batches and end to end through a fleet of VendingMachines, then checks that the
+aggregates rebuilt from the flushed file match the live ones.
+'''
+from fleet import Fleet
+from fleet_load import generate_events, generate_sessions, make_inventory, run_sessions
+from transaction_log import TransactionLog
+import contextlib
+import os
+import tempfile
+import time
+
+EVENTS = 1_000_000
+SESSIONS = 100_000
+MACHINES = 2_000
+BATCH = 10_000
+
+def main():
+    columns = generate_events(EVENTS, MACHINES)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "single.log")
+        transaction_log = TransactionLog(path)
+        timestamps, machine_ids, kinds, item_codes, amounts = columns
+        start = time.perf_counter()
+        for event in zip(machine_ids, kinds, item_codes, amounts, timestamps):
+            transaction_log.record(*event)
+        transaction_log.close()
+        elapsed = time.perf_counter() - start
+        print(f"record: {EVENTS / elapsed:,.0f} events/s, {os.path.getsize(path) / EVENTS:.1f} bytes/event on disk")
+
+        path = os.path.join(directory, "batched.log")
+        batched = TransactionLog(path)
+        start = time.perf_counter()
+        for offset in range(0, EVENTS, BATCH):
+            batched.extend(*(column[offset:offset + BATCH] for column in columns))
+        batched.close()
+        elapsed = time.perf_counter() - start
+        print(f"extend in batches of {BATCH}: {EVENTS / elapsed:,.0f} events/s")
+
+        rebuilt = TransactionLog()
+        rebuilt.replay(path)
+        assert rebuilt.events == transaction_log.events == EVENTS
+        for live, replayed in ((transaction_log.sales_by_item, rebuilt.sales_by_item),
+                               (transaction_log.sales_by_hour, rebuilt.sales_by_hour)):
+            assert {key: (totals.count, totals.revenue) for key, totals in live.items()} == \
+                   {key: (totals.count, totals.revenue) for key, totals in replayed.items()}
+        print("aggregates rebuilt from the file match the live ones")
+
+        path = os.path.join(directory, "fleet.log")
+        fleet = Fleet(MACHINES, make_inventory, TransactionLog(path))
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            start = time.perf_counter()
+            run_sessions(fleet, generate_sessions(SESSIONS, MACHINES))
+            fleet.close()
+            elapsed = time.perf_counter() - start
+        print(f"{SESSIONS} sessions through {MACHINES} machines: {SESSIONS / elapsed:,.0f} sessions/s, "
+              f"{fleet.transaction_log.events / elapsed:,.0f} events/s")
+
+    print("best sellers:")
+    for code, totals in transaction_log.top_items(3):
+        print(f"  item {code}: {totals.count} sold, ${totals.revenue:,.0f}")
+    print(f"refunded ${transaction_log.refunds:,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+'''
+Sells items across a fleet and plans restocks from the low-stock indexes, then
+checks every plan against a full scan of all machines and compares their cost.
+'''
+from fleet import Fleet
+from fleet_load import generate_sessions, make_inventory, run_sessions
+from restock_planner import RestockPlanner, RestockTask
+from transaction_log import TransactionLog
+import contextlib
+import gc
+import os
+import time
+
+MACHINES = 3_000
+PAR_LEVEL = 12
+THRESHOLD = 3
+ROUNDS = 20
+SESSIONS_PER_ROUND = 20_000
+# items the crews can refill between rounds
+CREW_CAPACITY = 3_000
+
+def full_scan(fleet: Fleet):
+    low = []
+    for machine_id, vending_machine in fleet.machines.items():
+        for code, item in vending_machine.inventory.items.items():
+            if item.quantity < THRESHOLD:
+                low.append((item.quantity, machine_id, code))
+    low.sort()
+    return [RestockTask(machine_id, code, fleet.get_machine(machine_id).inventory.items[code].name, quantity,
+                        PAR_LEVEL - quantity) for quantity, machine_id, code in low]
+
+def main():
+    fleet = Fleet(MACHINES, lambda: make_inventory(PAR_LEVEL), TransactionLog())
+    planner = RestockPlanner(fleet, threshold=THRESHOLD, par_level=PAR_LEVEL)
+    plan_time = scan_time = 0.0
+    with open(os.devnull, "w") as devnull:
+        for round_no in range(ROUNDS):
+            with contextlib.redirect_stdout(devnull):
+                run_sessions(fleet, generate_sessions(SESSIONS_PER_ROUND, MACHINES, seed=round_no))
+
+            # leave the garbage from the sales out of the timings
+            gc.collect()
+            start = time.perf_counter()
+            plan = planner.plan()
+            plan_time += time.perf_counter() - start
+            start = time.perf_counter()
+            expected = full_scan(fleet)
+            scan_time += time.perf_counter() - start
+            assert plan == expected
+
+            # the crews get through the most urgent items before the next round
+            for task in plan[:CREW_CAPACITY]:
+                planner.restock(task)
+            print(f"round {round_no}: {len(plan)} items below {THRESHOLD}, "
+                  f"{sum(task.quantity == 0 for task in plan)} sold out")
+
+    print(f"planning from the indexes took {plan_time * 1e3 / ROUNDS:.2f}ms a round, "
+          f"a full scan {scan_time * 1e3 / ROUNDS:.2f}ms, plans matched")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+'''
+Measures state transitions per second with the shared states and dispatch table,
+against the previous design that allocated a state object on every transition
+and signalled invalid actions by raising NotImplementedError.
+'''
+from fleet_load import make_inventory
+from States.cash_inserted import CashInserted
+from States.dispense import Dispense
+from States.idle import Idle
+from strict_vending_machine import StrictVendingMachine
+from vending_machine import VendingMachine
+import contextlib
+import os
+import time
+
+SESSIONS = 100_000
+# actions in a session, three of them invalid in the state they arrive in
+ACTIONS_PER_SESSION = 7
+
+class AllocatingVendingMachine(StrictVendingMachine):
+    """The previous design: a new state object per transition and exceptions for invalid actions."""
+
+    def insert_cash(self, amount):
+        self.vending_state.insert_cash(self, amount)
+
+    def select_product(self, code):
+        self.vending_state.select_product(self, code)
+
+    def refund(self):
+        self.vending_state.refund(self)
+
+    def dispense_product(self):
+        self.vending_state.dispense_product(self)
+
+    def update_amount(self, amount: int):
+        super().update_amount(amount)
+        if isinstance(self.vending_state, Idle):
+            self.updare_vending_state_to_cash_inserted()
+
+    def update_vending_state_to_idle(self):
+        self.vending_state = Idle()
+
+    def updare_vending_state_to_cash_inserted(self):
+        self.vending_state = CashInserted()
+
+    def update_vending_state_to_dispense(self):
+        self.vending_state = Dispense()
+
+def session_with_exceptions(vending_machine):
+    try:
+        vending_machine.dispense_product()
+    except NotImplementedError:
+        pass
+    try:
+        vending_machine.select_product(1)
+    except NotImplementedError:
+        pass
+    vending_machine.insert_cash(5)
+    vending_machine.insert_cash(1)
+    vending_machine.select_product(3)
+    try:
+        vending_machine.insert_cash(1)
+    except NotImplementedError:
+        pass
+    vending_machine.dispense_product()
+
+def session_with_result_codes(vending_machine):
+    vending_machine.dispense_product()
+    vending_machine.select_product(1)
+    vending_machine.insert_cash(5)
+    vending_machine.insert_cash(1)
+    vending_machine.select_product(3)
+    vending_machine.insert_cash(1)
+    vending_machine.dispense_product()
+
+def measure(vending_machine, session):
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        session(vending_machine)
+    return SESSIONS * ACTIONS_PER_SESSION / (time.perf_counter() - start)
+
+def main():
+    quantity = SESSIONS + 1
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        before = measure(AllocatingVendingMachine(make_inventory(quantity)), session_with_exceptions)
+        strict = measure(StrictVendingMachine(make_inventory(quantity)), session_with_exceptions)
+        after = measure(VendingMachine(make_inventory(quantity)), session_with_result_codes)
+    print(f"allocated states, exceptions:    {before:,.0f} actions/s")
+    print(f"shared states, strict wrapper:   {strict:,.0f} actions/s")
+    print(f"shared states, result codes:     {after:,.0f} actions/s ({after / before:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""This module pays change out of a machine's coin tubes with as few coins as possible.
+
+Amounts and denominations are integers in the machine's currency unit. Inserted
+money whose denomination has no tube, such as notes, goes to the cash box.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+import threading
+
+class CoinTubes:
+
+    def __init__(self, counts: Dict[int, int]):
+        """counts maps every denomination with a tube to the coins in it."""
+        self.counts: Dict[int, int] = {}
+        self.cash_box = 0
+        # bumped whenever a tube is added or removed
+        self.generation = 0
+        for denomination, count in counts.items():
+            self.add_tube(denomination, count)
+
+    @property
+    def denominations(self):
+        return self._denominations
+
+    def add_tube(self, denomination: int, count: int = 0):
+        if denomination <= 0 or count < 0:
+            raise ValueError("Denominations must be positive and counts cannot be negative")
+        self.counts[denomination] = self.counts.get(denomination, 0) + count
+        self._denominations = tuple(sorted(self.counts, reverse=True))
+        self.generation += 1
+
+    def remove_tube(self, denomination: int):
+        if denomination not in self.counts:
+            raise ValueError(f"There is no tube for {denomination}")
+        del self.counts[denomination]
+        self._denominations = tuple(sorted(self.counts, reverse=True))
+        self.generation += 1
+
+    def deposit(self, inserted: Iterable[int]):
+        for money in inserted:
+            if money in self.counts:
+                self.counts[money] += 1
+            else:
+                self.cash_box += money
+
+    def undo_deposit(self, inserted: Iterable[int]):
+        for money in inserted:
+            if money in self.counts:
+                self.counts[money] -= 1
+            else:
+                self.cash_box -= money
+
+    def withdraw(self, coins: Dict[int, int]):
+        for denomination, count in coins.items():
+            if self.counts.get(denomination, 0) < count:
+                raise ValueError(f"The {denomination} tube has only {self.counts.get(denomination, 0)} coins")
+        for denomination, count in coins.items():
+            self.counts[denomination] -= count
+
+    def refill(self, denomination: int, count: int):
+        if denomination not in self.counts:
+            raise ValueError(f"There is no tube for {denomination}")
+        self.counts[denomination] += count
+
+    def total(self):
+        return sum(denomination * count for denomination, count in self.counts.items())
+
+def min_coins(amount: int, denominations, counts):
+    """Returns {denomination: count} paying amount exactly with the fewest coins, or None.
+
+    A bounded coin change dynamic program: every tube is split into bundles of 1, 2,
+    4, ... coins, and each bundle is used at most once.
+    """
+    if amount == 0:
+        return {}
+    unreachable = amount + 1
+    fewest = [0] + [unreachable] * amount
+    bundles, taken = [], []
+    for denomination, count in zip(denominations, counts):
+        size = 1
+        while count > 0:
+            bundle = min(size, count)
+            count -= bundle
+            size *= 2
+            value = denomination * bundle
+            if value > amount:
+                break
+            used = bytearray(amount + 1)
+            for target in range(amount, value - 1, -1):
+                coins = fewest[target - value] + bundle
+                if coins < fewest[target]:
+                    fewest[target] = coins
+                    used[target] = 1
+            bundles.append((denomination, bundle, value))
+            taken.append(used)
+    if fewest[amount] == unreachable:
+        return None
+
+    change, remaining = {}, amount
+    for (denomination, bundle, value), used in zip(reversed(bundles), reversed(taken)):
+        if used[remaining]:
+            change[denomination] = change.get(denomination, 0) + bundle
+            remaining -= value
+    return change
+
+class ChangeMaker:
+    """Plans and pays change from CoinTubes, remembering the plans it has computed.
+
+    A plan only depends on the amount and, for every tube, on how many of its coins
+    could be used, which is at most amount // denomination. Plans are cached on the
+    amount and those clipped counts, so entries stay correct as coins come and go
+    and are reused while the tubes are well stocked. Adding or removing a tube
+    clears the cache.
+    """
+
+    def __init__(self, tubes: CoinTubes, cache_size: int = 4096):
+        self.tubes = tubes
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Optional[Dict[int, int]]]" = OrderedDict()
+        self._generation = tubes.generation
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_change(self, amount: int, inserted: Iterable[int] = ()):
+        """Returns the coins to pay amount from the tubes plus the inserted money, or None if it cannot be paid."""
+        if amount < 0:
+            raise ValueError("Change cannot be negative")
+        with self._lock:
+            tubes = self.tubes
+            if tubes.generation != self._generation:
+                self._cache.clear()
+                self._generation = tubes.generation
+            counts = dict(tubes.counts)
+            for money in inserted:
+                if money in counts:
+                    counts[money] += 1
+            denominations = tubes.denominations
+            signature = tuple(min(counts[denomination], amount // denomination) for denomination in denominations)
+            key = (amount, signature)
+
+            change = self._cache.get(key, False)
+            if change is not False:
+                self.hits += 1
+                self._cache.move_to_end(key)
+            else:
+                self.misses += 1
+                change = min_coins(amount, denominations, signature)
+                if self.cache_size:
+                    self._cache[key] = change
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+            return None if change is None else dict(change)
+
+    def pay_out(self, amount: int, inserted: Iterable[int]):
+        """Moves the inserted money into the tubes and takes the change out of them.
+
+        Returns the coins paid, or None, leaving the tubes untouched, if the change
+        cannot be made.
+        """
+        inserted = list(inserted)
+        with self._lock:
+            change = self.make_change(amount, inserted)
+            if change is None:
+                return None
+            self.tubes.deposit(inserted)
+            self.tubes.withdraw(change)
+            return change
+
+    def cancel_payout(self, inserted: Iterable[int], change: Dict[int, int]):
+        """Reverses pay_out when the sale falls through after the change was taken."""
+        with self._lock:
+            self.tubes.deposit(denomination for denomination, count in change.items() for _ in range(count))
+            self.tubes.undo_deposit(inserted)
+
+def describe(change: Dict[int, int]):
+    return ", ".join(f"{count} x ${denomination}" for denomination, count in sorted(change.items(), reverse=True))
@@ -0,0 +1,40 @@
+from transaction_log import SELECT
+from vending_machine import VendingMachine
+
+class CustomerSession(VendingMachine):
+    """One customer's transaction on a machine that serves several customers at once.
+
+    Each session keeps its own amount, product and state, and shares the
+    machine's inventory. Selecting a product reserves a unit, dispensing commits
+    it and a refund releases it, so concurrent sessions can never sell more
+    units than are in stock.
+    """
+
+    def __init__(self, vending_machine: VendingMachine):
+        super().__init__(vending_machine.inventory, machine_id=vending_machine.machine_id)
+        self.transaction_log = vending_machine.transaction_log
+        self.change_maker = vending_machine.change_maker
+
+    def update_product(self, code):
+        self.inventory.check_validity(code)
+        change = self.caculate_change(code)
+        if change < 0:
+            raise ArithmeticError(f"Infficient balance for the select item, you are short by ${-change}")
+        if not self.inventory.reserve(code):
+            raise ValueError(f"There are no more {self.inventory.get_item(code).name}'s available.")
+
+        self.product = code
+        self.record_event(SELECT, code, self.amount)
+        self.update_vending_state_to_dispense()
+
+    def cancel(self):
+        """Abandons the session in any state, e.g. when an app order times out, and refunds the customer."""
+        self.refund_customer()
+
+    def refund_customer(self):
+        if self.product is not None:
+            self.inventory.rollback(self.product)
+        super().refund_customer()
+
+    def take_product(self):
+        self.inventory.commit(self.product)
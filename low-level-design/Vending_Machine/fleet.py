@@ -0,0 +1,28 @@
+from inventory import Inventory
+from transaction_log import TransactionLog
+from typing import Callable, Dict
+from vending_machine import VendingMachine
+
+class Fleet:
+    """Vending machines that record their transactions into one shared TransactionLog."""
+
+    def __init__(self, machine_count: int, make_inventory: Callable[[], Inventory], transaction_log: TransactionLog):
+        self.transaction_log = transaction_log
+        self.machines: Dict[int, VendingMachine] = {}
+        for machine_id in range(machine_count):
+            self.add_machine(VendingMachine(make_inventory(), machine_id=machine_id))
+
+    def add_machine(self, vending_machine: VendingMachine):
+        vending_machine.transaction_log = self.transaction_log
+        self.machines[vending_machine.machine_id] = vending_machine
+
+    def get_machine(self, machine_id: int):
+        if machine_id not in self.machines:
+            raise ValueError(f"Machine {machine_id} is not part of the fleet")
+        return self.machines[machine_id]
+
+    def flush(self):
+        self.transaction_log.flush()
+
+    def close(self):
+        self.transaction_log.close()
@@ -0,0 +1,62 @@
+'''
+Synthetic load for a vending machine fleet: raw transaction events as columns,
+and customer sessions that are played through real VendingMachines.
+'''
+from array import array
+from inventory import Inventory
+from item import Item
+from transaction_log import INSERT, SELECT, DISPENSE, REFUND, NO_ITEM
+import random
+
+CATALOG = [('Coke', 0.5, 2), ('Pepsi', 0.5, 2), ('Sprite', 0.5, 2), ('Lays', 1, 3), ('Doritos', 1, 3),
+           ('Fritos', 1, 3), ('Twix', 2, 4), ('Kinder', 2, 3), ('Burger', 2, 5)]
+NOTES = [1, 1, 2, 5, 5, 10]
+
+def make_inventory(quantity: int = 10_000):
+    return Inventory([Item(name, cost, price, code, quantity) for code, (name, cost, price) in enumerate(CATALOG, 1)])
+
+def generate_sessions(count: int, machines: int, seed: int = 0):
+    """Yields (machine id, notes inserted, item code, refund instead of buying) for count customers."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        code = rng.randrange(1, len(CATALOG) + 1)
+        price, notes = CATALOG[code - 1][2], []
+        while sum(notes) < price:
+            notes.append(rng.choice(NOTES))
+        yield rng.randrange(machines), notes, code, rng.random() < 0.05
+
+def generate_events(count: int, machines: int, start: float = 1.7e9, events_per_second: float = 500.0, seed: int = 0):
+    """Returns (timestamps, machine ids, kinds, item codes, amounts) arrays of count events from whole sessions."""
+    rng = random.Random(seed)
+    timestamps, machine_ids, kinds = array('d'), array('l'), array('b')
+    item_codes, amounts = array('l'), array('d')
+    now = start
+    for machine_id, notes, code, refund in generate_sessions(count, machines, seed):
+        price, paid = CATALOG[code - 1][2], sum(notes)
+        session = [(INSERT, NO_ITEM, note) for note in notes]
+        session += [(REFUND, NO_ITEM, paid)] if refund else [(SELECT, code, paid), (DISPENSE, code, price)]
+        for kind, item_code, amount in session:
+            now += rng.expovariate(events_per_second)
+            timestamps.append(now)
+            machine_ids.append(machine_id)
+            kinds.append(kind)
+            item_codes.append(item_code)
+            amounts.append(amount)
+            if len(kinds) == count:
+                return timestamps, machine_ids, kinds, item_codes, amounts
+    return timestamps, machine_ids, kinds, item_codes, amounts
+
+def run_sessions(fleet, sessions):
+    """Plays every session through its machine and returns how many there were."""
+    played = 0
+    for machine_id, notes, code, refund in sessions:
+        vending_machine = fleet.get_machine(machine_id)
+        for note in notes:
+            vending_machine.insert_cash(note)
+        if refund:
+            vending_machine.refund()
+        else:
+            vending_machine.select_product(code)
+            vending_machine.dispense_product()
+        played += 1
+    return played
@@ -1,33 +1,120 @@
 from item import Item
 from typing import Dict, List
+import heapq
+import threading
 
 class Inventory:
 
     def __init__(self, items: List[Item]):
         self.items: Dict[int, Item] = {}
+        # units held by open sessions that have selected an item but not taken it yet
+        self.reserved: Dict[int, int] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        # min-heap of (quantity, code). A change pushes a new entry and leaves the old
+        # one in place; entries whose quantity no longer matches the item are stale.
+        self._stock_heap = []
+        self._stock_lock = threading.Lock()
+        # called with (inventory, code, quantity) whenever an item's quantity changes
+        self.stock_listener = None
 
         for item in items:
             self.add_item(item)
     
     def add_item(self, item: Item):
         self.items[item.code] = item
+        self.reserved.setdefault(item.code, 0)
+        with self._locks.setdefault(item.code, threading.Lock()):
+            self._stock_changed(item.code)
 
     def remove_item(self, code: int):
         self.check_validity(code)
         del self.items[code]
+        del self.reserved[code]
+        del self._locks[code]
     
     def update_quantity(self, code: int, new_quantity: int):
         self.check_validity(code)
         if new_quantity <= 0:
             raise ValueError("Quantity cannot be negative")
-        self.items[code].update_quantity(new_quantity)
+        with self._locks[code]:
+            self.items[code].update_quantity(new_quantity)
+            self._stock_changed(code)
 
     def decrement_quantity(self, code: int):
         self.check_validity(code)
         item = self.items[code]
-        if item.quantity < 0:
-            raise ValueError(f"There are no more {item}'s available.")
-        item.quantity -= 1
+        with self._locks[code]:
+            if item.quantity - self.reserved[code] <= 0:
+                raise ValueError(f"There are no more {item}'s available.")
+            item.quantity -= 1
+            self._stock_changed(code)
+
+    def reserve(self, code: int):
+        """Holds one unit of an item for a session. Returns False if none are left."""
+        self.check_validity(code)
+        with self._locks[code]:
+            if self.items[code].quantity - self.reserved[code] <= 0:
+                return False
+            self.reserved[code] += 1
+            return True
+
+    def commit(self, code: int):
+        """Takes a reserved unit out of stock."""
+        with self._locks[code]:
+            if self.reserved[code] <= 0:
+                raise ValueError(f"There is no reserved {self.items[code].name} to dispense")
+            self.reserved[code] -= 1
+            self.items[code].quantity -= 1
+            self._stock_changed(code)
+
+    def rollback(self, code: int):
+        """Returns a reserved unit to the stock."""
+        with self._locks[code]:
+            if self.reserved[code] <= 0:
+                raise ValueError(f"There is no reserved {self.items[code].name} to release")
+            self.reserved[code] -= 1
+
+    def _stock_changed(self, code: int):
+        # called with the item's lock held, so listeners see every item's quantities in order
+        quantity = self.items[code].quantity
+        with self._stock_lock:
+            heapq.heappush(self._stock_heap, (quantity, code))
+            # drop the stale entries once they outnumber the live ones
+            if len(self._stock_heap) > 2 * len(self.items) + 16:
+                self._stock_heap = [(item.quantity, item_code) for item_code, item in self.items.items()]
+                heapq.heapify(self._stock_heap)
+        if self.stock_listener is not None:
+            self.stock_listener(self, code, quantity)
+
+    def _is_current(self, quantity: int, code: int):
+        item = self.items.get(code)
+        return item is not None and item.quantity == quantity
+
+    def lowest_stock(self):
+        """Returns (quantity, code) of the item with the fewest units left, or None if there are no items."""
+        with self._stock_lock:
+            heap = self._stock_heap
+            while heap and not self._is_current(*heap[0]):
+                heapq.heappop(heap)
+            return heap[0] if heap else None
+
+    def low_stock(self, threshold: int):
+        """Returns (quantity, code) for every item with fewer than threshold units, fewest first.
+
+        Only the part of the heap below the threshold is visited.
+        """
+        with self._stock_lock:
+            heap = self._stock_heap
+            found, stack = set(), [0] if heap else []
+            while stack:
+                position = stack.pop()
+                quantity, code = heap[position]
+                if quantity >= threshold:
+                    continue
+                if self._is_current(quantity, code):
+                    found.add((quantity, code))
+                stack.extend(child for child in (2 * position + 1, 2 * position + 2) if child < len(heap))
+        return sorted(found)
 
     def get_item(self, code):
         self.check_validity(code)
@@ -1,6 +1,6 @@
 from item import Item
 from inventory import Inventory
-from vending_machine import VendingMachine
+from strict_vending_machine import StrictVendingMachine
 
 coke = Item('Coke', 0.5, 2, 1, 10)
 pepsi = Item('Pepsi', 0.5, 2, 2, 10)
@@ -14,7 +14,7 @@ burger = Item('Burger', 2, 5, 9, 10)
 
 items = [coke, pepsi, sprite, lays, doritos, fritos, twix, kinder, burger]
 inventory = Inventory(items=items)
-vending_machine = VendingMachine(inventory=inventory)
+vending_machine = StrictVendingMachine(inventory=inventory)
 
 print("Welcome to our Vending Machine")
 valid_options = [1, 2, 3, 4]
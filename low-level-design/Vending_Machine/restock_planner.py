@@ -0,0 +1,58 @@
+from collections import namedtuple
+from fleet import Fleet
+from inventory import Inventory
+import threading
+
+RestockTask = namedtuple('RestockTask', ['machine_id', 'code', 'name', 'quantity', 'refill'])
+
+class RestockPlanner:
+    """Lists what the restock crews should load across a fleet, most urgent first.
+
+    Each machine's low items are read from its inventory's stock index when the
+    machine is added, and kept current afterwards from the inventory's change
+    notifications, so a plan never looks at items that are not low.
+    """
+
+    def __init__(self, fleet: Fleet, threshold: int = 3, par_level: int = 10):
+        """Items with fewer than threshold units are restocked up to par_level units."""
+        self.fleet = fleet
+        self.threshold = threshold
+        self.par_level = par_level
+        # (machine id, item code) -> units left, for every item below the threshold
+        self._low = {}
+        self._lock = threading.Lock()
+        self._machine_ids = {}
+        for machine_id, vending_machine in fleet.machines.items():
+            self.watch(machine_id, vending_machine.inventory)
+
+    def watch(self, machine_id: int, inventory: Inventory):
+        self._machine_ids[id(inventory)] = machine_id
+        inventory.stock_listener = self._stock_changed
+        with self._lock:
+            for quantity, code in inventory.low_stock(self.threshold):
+                self._low[(machine_id, code)] = quantity
+
+    def _stock_changed(self, inventory: Inventory, code: int, quantity: int):
+        key = (self._machine_ids[id(inventory)], code)
+        with self._lock:
+            if quantity < self.threshold:
+                self._low[key] = quantity
+            else:
+                self._low.pop(key, None)
+
+    def __len__(self):
+        return len(self._low)
+
+    def plan(self, limit: int = None):
+        """Returns RestockTasks ordered by fewest units left, then machine and item code."""
+        with self._lock:
+            low = [(quantity, machine_id, code) for (machine_id, code), quantity in self._low.items()]
+        low.sort()
+        if limit is not None:
+            del low[limit:]
+        return [RestockTask(machine_id, code, self.fleet.get_machine(machine_id).inventory.items[code].name, quantity,
+                            self.par_level - quantity) for quantity, machine_id, code in low]
+
+    def restock(self, task: RestockTask):
+        """Marks a task as done by filling the item up to the par level."""
+        self.fleet.get_machine(task.machine_id).inventory.update_quantity(task.code, self.par_level)
@@ -0,0 +1,85 @@
+'''
+Runs customer sessions from many threads against one machine and checks that no
+item is ever oversold, then reports transactions per second as threads are added.
+
+For the throughput table each thread brings its own share of stock, so nothing
+sells out and every row runs the same mix of sales and cancellations. A final
+run with scarce stock makes the threads fight over the last units, which is
+where overselling would show up. Its rate is not comparable, since sold-out
+sessions are cheap refunds.
+'''
+from customer_session import CustomerSession
+from fleet_load import make_inventory
+from transaction_log import TransactionLog
+from vending_machine import VendingMachine
+import contextlib
+import os
+import random
+import threading
+import time
+
+SESSIONS_PER_THREAD = 6_000
+# units of every item per thread; a thread cannot buy more than one unit a session
+STOCK_PER_THREAD = SESSIONS_PER_THREAD
+SCARCE_STOCK = 2_000
+THREADS = [1, 2, 4, 8, 16]
+
+def customer(vending_machine: VendingMachine, seed: int, sold: dict, sold_out: list):
+    rng = random.Random(seed)
+    codes = list(vending_machine.inventory.items)
+    for _ in range(SESSIONS_PER_THREAD):
+        session = CustomerSession(vending_machine)
+        session.insert_cash(5)
+        code = rng.choice(codes)
+        try:
+            session.select_product(code)
+        except ValueError:
+            # sold out, the customer takes their money back
+            session.refund()
+            sold_out[seed] += 1
+            continue
+        if rng.random() < 0.1:
+            # an app order that was never collected
+            session.cancel()
+        else:
+            session.dispense_product()
+            sold[code] = sold.get(code, 0) + 1
+
+def run(threads: int, stock: int):
+    """Returns (transactions/s, items sold, sold-out sessions)."""
+    vending_machine = VendingMachine(make_inventory(stock))
+    vending_machine.transaction_log = TransactionLog()
+    sold_by_thread = [{} for _ in range(threads)]
+    sold_out = [0] * threads
+    workers = [threading.Thread(target=customer, args=(vending_machine, seed, sold_by_thread[seed], sold_out))
+               for seed in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    inventory = vending_machine.inventory
+    for code, item in inventory.items.items():
+        sold = sum(thread_sold.get(code, 0) for thread_sold in sold_by_thread)
+        assert item.quantity >= 0, f"item {code} went negative"
+        assert sold == stock - item.quantity, f"item {code}: {sold} sold but stock fell by {stock - item.quantity}"
+        assert inventory.reserved[code] == 0, f"item {code} has units still reserved"
+        assert vending_machine.transaction_log.sales_by_item.get(code) is None or \
+            vending_machine.transaction_log.sales_by_item[code].count == sold
+    return (threads * SESSIONS_PER_THREAD / elapsed, sum(stock - item.quantity for item in inventory.items.values()),
+            sum(sold_out))
+
+def main():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        results = [(threads, *run(threads, STOCK_PER_THREAD * threads)) for threads in THREADS]
+        scarce = run(THREADS[-1], SCARCE_STOCK)
+    for threads, rate, sold, sold_out in results:
+        print(f"{threads:2d} threads: {rate:,.0f} transactions/s, {sold} items sold, {sold_out} sold out, none oversold")
+    _, sold, sold_out = scarce
+    print(f"scarce stock, {THREADS[-1]} threads: {sold} items sold, {sold_out} sessions found their item sold out, "
+          f"none oversold")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+from States.dispatch import ACTION_METHODS
+from vending_machine import VendingMachine
+
+class StrictVendingMachine(VendingMachine):
+    """A VendingMachine that raises NotImplementedError for invalid actions instead of returning INVALID_ACTION."""
+
+    def invalid_action(self, state, action: int, *args):
+        # the State base class raises with the message for the action
+        getattr(state, ACTION_METHODS[action])(self, *args)
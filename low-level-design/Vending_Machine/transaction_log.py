@@ -0,0 +1,173 @@
+"""This module collects transaction events from a fleet of vending machines.
+
+Events are appended to columnar buffers, one array per field, and the sales
+aggregates are updated as each event arrives. Full buffers are written to a
+file as raw arrays, one batch after another, and the buffers start over.
+"""
+from array import array
+from typing import Callable, Dict
+import json
+import os
+import threading
+import time
+
+INSERT, SELECT, DISPENSE, REFUND = 0, 1, 2, 3
+EVENT_NAMES = {INSERT: "insert", SELECT: "select", DISPENSE: "dispense", REFUND: "refund"}
+NO_ITEM = -1
+
+MAGIC = b"VMTXLOG1\n"
+# field name and array typecode of every column, in file order
+COLUMNS = (("timestamps", 'd'), ("machine_ids", 'l'), ("kinds", 'b'), ("item_codes", 'l'), ("amounts", 'd'))
+
+class SalesTotals:
+    """Number of items sold and their revenue."""
+
+    __slots__ = ('count', 'revenue')
+
+    def __init__(self):
+        self.count = 0
+        self.revenue = 0.0
+
+    def __repr__(self):
+        return f"SalesTotals(count={self.count}, revenue={self.revenue})"
+
+class TransactionLog:
+
+    def __init__(self, path: str = None, batch_size: int = 65536, flush_interval: float = 5.0,
+                 clock: Callable[[], float] = time.time):
+        """Events are written to path when batch_size are buffered and every flush_interval seconds.
+
+        The interval is kept by a daemon thread, so a quiet machine's events still reach
+        the file. Call close() at shutdown to write the rest.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._new_buffers()
+        self._last_flush = time.monotonic()
+        self.events = 0
+        self.sales_by_item: Dict[int, SalesTotals] = {}
+        self.sales_by_machine: Dict[int, SalesTotals] = {}
+        # hours since the epoch -> sales in that hour
+        self.sales_by_hour: Dict[int, SalesTotals] = {}
+        self.refunds = 0.0
+        self._closed = threading.Event()
+        if path:
+            if not os.path.exists(path) or os.path.getsize(path) == 0:
+                with open(path, "wb") as log:
+                    log.write(MAGIC)
+            if flush_interval is not None:
+                threading.Thread(target=self._flush_periodically, name="transaction-log-flusher", daemon=True).start()
+
+    def _new_buffers(self):
+        self.timestamps = array('d')
+        self.machine_ids = array('l')
+        self.kinds = array('b')
+        self.item_codes = array('l')
+        self.amounts = array('d')
+
+    def __len__(self):
+        """The number of buffered events."""
+        return len(self.kinds)
+
+    def record(self, machine_id: int, kind: int, item_code: int = NO_ITEM, amount: float = 0, timestamp: float = None):
+        if timestamp is None:
+            timestamp = self.clock()
+        with self._lock:
+            self.timestamps.append(timestamp)
+            self.machine_ids.append(machine_id)
+            self.kinds.append(kind)
+            self.item_codes.append(item_code)
+            self.amounts.append(amount)
+            self.events += 1
+            self._aggregate(machine_id, kind, item_code, amount, timestamp)
+            if len(self.kinds) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def extend(self, timestamps, machine_ids, kinds, item_codes, amounts):
+        """Records a batch of events given as parallel sequences."""
+        with self._lock:
+            for machine_id, kind, item_code, amount, timestamp in zip(machine_ids, kinds, item_codes, amounts,
+                                                                      timestamps):
+                self._aggregate(machine_id, kind, item_code, amount, timestamp)
+            self.timestamps.extend(timestamps)
+            self.machine_ids.extend(machine_ids)
+            self.kinds.extend(kinds)
+            self.item_codes.extend(item_codes)
+            self.amounts.extend(amounts)
+            self.events += len(kinds)
+            if len(self.kinds) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def _aggregate(self, machine_id: int, kind: int, item_code: int, amount: float, timestamp: float):
+        if kind == DISPENSE:
+            for totals, key in ((self.sales_by_item, item_code), (self.sales_by_machine, machine_id),
+                                (self.sales_by_hour, int(timestamp // 3600))):
+                sales = totals.get(key)
+                if sales is None:
+                    sales = totals[key] = SalesTotals()
+                sales.count += 1
+                sales.revenue += amount
+        elif kind == REFUND:
+            self.refunds += amount
+
+    def flush(self):
+        """Appends the buffered events to the file as one batch and empties the buffers."""
+        with self._lock:
+            self._flush()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            with self._lock:
+                if self._closed.is_set():
+                    return
+                self._flush()
+
+    def close(self):
+        """Writes the buffered events and stops the flush thread."""
+        with self._lock:
+            self._closed.set()
+            self._flush()
+
+    def _flush(self):
+        self._last_flush = time.monotonic()
+        if not self.path or not self.kinds:
+            return
+        columns = [getattr(self, name) for name, _ in COLUMNS]
+        with open(self.path, "ab") as log:
+            log.write(json.dumps({"events": len(self.kinds)}).encode() + b"\n")
+            for values in columns:
+                values.tofile(log)
+        self._new_buffers()
+
+    def replay(self, path: str):
+        """Rebuilds the aggregates from the events in a log file written by flush."""
+        for batch in read_batches(path):
+            self.events += len(batch["kinds"])
+            for machine_id, kind, item_code, amount, timestamp in zip(batch["machine_ids"], batch["kinds"],
+                                                                      batch["item_codes"], batch["amounts"],
+                                                                      batch["timestamps"]):
+                self._aggregate(machine_id, kind, item_code, amount, timestamp)
+
+    def top_items(self, count: int = 10):
+        """Returns (item code, SalesTotals) for the items with the most revenue."""
+        return sorted(self.sales_by_item.items(), key=lambda entry: -entry[1].revenue)[:count]
+
+def read_batches(path: str):
+    """Yields every batch in a log file as a dict of column name -> array."""
+    with open(path, "rb") as log:
+        if log.readline() != MAGIC:
+            raise ValueError(f"{path} is not a transaction log")
+        while True:
+            header = log.readline()
+            if not header:
+                return
+            events = json.loads(header)["events"]
+            batch = {}
+            for name, typecode in COLUMNS:
+                values = array(typecode)
+                values.fromfile(log, events)
+                batch[name] = values
+            yield batch
@@ -1,27 +1,47 @@
+from change_maker import describe
 from inventory import Inventory
-from States.idle import Idle
-from States.cash_inserted import CashInserted
-from States.dispense import Dispense
+from States.dispatch import (DISPATCH, INVALID_ACTION, OK, INSERT_CASH, SELECT_PRODUCT, DISPENSE_PRODUCT, REQUEST_REFUND,
+                             IDLE_STATE, CASH_INSERTED_STATE, DISPENSE_STATE)
+from transaction_log import INSERT, SELECT, DISPENSE, REFUND, NO_ITEM
 
 class VendingMachine:
     
-    def __init__(self, inventory: Inventory):
-        self.vending_state = Idle()
+    def __init__(self, inventory: Inventory, machine_id: int = 0):
+        self.vending_state = IDLE_STATE
         self.inventory = inventory
         self.amount = 0
         self.product = None
+        self.machine_id = machine_id
+        # a TransactionLog that records every transaction event when set
+        self.transaction_log = None
+        # a ChangeMaker that pays change from the coin tubes when set
+        self.change_maker = None
+        # the coins and notes inserted in the current transaction
+        self.inserted = []
     
     def insert_cash(self, amount):
-        self.vending_state.insert_cash(self, amount)
+        return self.dispatch(INSERT_CASH, amount)
 
     def select_product(self, code):
-        self.vending_state.select_product(self, code)
+        return self.dispatch(SELECT_PRODUCT, code)
 
     def refund(self):
-        self.vending_state.refund(self)
+        return self.dispatch(REQUEST_REFUND)
 
     def dispense_product(self):
-        self.vending_state.dispense_product(self)
+        return self.dispatch(DISPENSE_PRODUCT)
+
+    def dispatch(self, action: int, *args):
+        """Performs an action in the current state. Returns OK, or INVALID_ACTION if the state does not allow it."""
+        state = self.vending_state
+        handler = DISPATCH[state.state_id][action]
+        if handler is None:
+            return self.invalid_action(state, action, *args)
+        handler(state, self, *args)
+        return OK
+
+    def invalid_action(self, state, action: int, *args):
+        return INVALID_ACTION
 
     def update_amount(self, amount: int):
         if not isinstance(amount, int):
@@ -30,7 +50,9 @@ class VendingMachine:
             raise ValueError("Amount cannot be negative")
         
         self.amount += amount
-        if isinstance(self.vending_state, Idle):
+        self.inserted.append(amount)
+        self.record_event(INSERT, NO_ITEM, amount)
+        if self.vending_state is IDLE_STATE:
             self.updare_vending_state_to_cash_inserted()
     
     def update_product(self, code):
@@ -40,42 +62,66 @@ class VendingMachine:
             raise ArithmeticError(f"Infficient balance for the select item, you are short by ${-change}")
         
         self.product = code
+        self.record_event(SELECT, code, self.amount)
         self.update_vending_state_to_dispense()
     
     def refund_customer(self):
         returned_amount = self.amount
+        self.record_event(REFUND, NO_ITEM, returned_amount)
         self.reset()
         print(f"{returned_amount} is refuned back to you")
     
     def reset(self):
         self.amount = 0
         self.product = None
+        self.inserted = []
         self.update_vending_state_to_idle()
         
     def dispense_to_customer(self):
         try:
-            self.inventory.decrement_quantity(self.product)
             change = self.caculate_change(self.product)
+            coins = None
+            if self.change_maker is not None:
+                coins = self.change_maker.pay_out(change, self.inserted)
+                if coins is None:
+                    raise ValueError(f"Cannot give ${change} in change, please insert the exact amount.")
+            try:
+                self.take_product()
+            except ValueError:
+                if coins is not None:
+                    self.change_maker.cancel_payout(self.inserted, coins)
+                raise
             item = self.inventory.get_item(self.product)
+            self.record_event(DISPENSE, self.product, item.selling_price)
             print(f"${item.name} has been dispensed.")
-            print(f"${change} has been refuned back to you.")
+            if coins:
+                print(f"${change} has been refuned back to you as {describe(coins)}.")
+            else:
+                print(f"${change} has been refuned back to you.")
             self.reset()
         except ValueError as error:
             print(error)
             self.refund_customer()
 
+    def take_product(self):
+        self.inventory.decrement_quantity(self.product)
+
+    def record_event(self, kind: int, item_code: int, amount):
+        if self.transaction_log is not None:
+            self.transaction_log.record(self.machine_id, kind, item_code, amount)
+
     def caculate_change(self, code):
         item = self.inventory.get_item(code)
         return self.amount - item.selling_price
 
     def update_vending_state_to_idle(self):
-        self.vending_state = Idle()
+        self.vending_state = IDLE_STATE
     
     def updare_vending_state_to_cash_inserted(self):
-        self.vending_state = CashInserted()
+        self.vending_state = CASH_INSERTED_STATE
     
     def update_vending_state_to_dispense(self):
-        self.vending_state = Dispense()
+        self.vending_state = DISPENSE_STATE
     
     def print_inventory(self):
         self.inventory.available_items()